@@ -12,6 +12,8 @@ Version: v2.1
 Auteur: Claude Code
 """
 
+import os
+import stat
 import pytest
 import tempfile
 import json
@@ -159,6 +161,55 @@ class TestCacheManager:
 
         assert is_valid is False
 
+    def test_is_cached_fingerprint_skips_hash(self, temp_cache_dir, temp_file, monkeypatch):
+        """Test qu'une empreinte (taille, mtime) identique évite de re-hasher le fichier."""
+        cm = CacheManager(str(temp_cache_dir))
+
+        cm.save_to_cache("test_key", str(temp_file), [{"test": "data"}])
+
+        def fail_hash(file_path):
+            raise AssertionError("get_file_hash ne doit pas être appelé")
+
+        monkeypatch.setattr(cm, "get_file_hash", fail_hash)
+
+        assert cm.is_cached("test_key", str(temp_file)) is True
+
+    def test_is_cached_refreshes_fingerprint_after_touch(self, temp_cache_dir, temp_file, monkeypatch):
+        """Test qu'un fichier touché (contenu identique) n'est re-hashé qu'une seule fois."""
+        cm = CacheManager(str(temp_cache_dir))
+
+        cm.save_to_cache("test_key", str(temp_file), [{"test": "data"}])
+
+        # Changer le mtime sans modifier le contenu
+        file_stat = temp_file.stat()
+        os.utime(temp_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+        assert cm.is_cached("test_key", str(temp_file)) is True
+
+        def fail_hash(file_path):
+            raise AssertionError("get_file_hash ne doit pas être appelé")
+
+        monkeypatch.setattr(cm, "get_file_hash", fail_hash)
+
+        assert cm.is_cached("test_key", str(temp_file)) is True
+        assert cm.load_from_cache("test_key")["data"] == [{"test": "data"}]
+
+    def test_cache_entry_respects_umask(self, temp_cache_dir, temp_file):
+        """Test que les entrées écrites gardent les droits d'un open() classique (0666 & ~umask)."""
+        cm = CacheManager(str(temp_cache_dir))
+        umask = os.umask(0)
+        os.umask(umask)
+        cache_file = temp_cache_dir / "test_key.json"
+
+        cm.save_to_cache("test_key", str(temp_file), [{"test": "data"}])
+        assert stat.S_IMODE(cache_file.stat().st_mode) == 0o666 & ~umask
+
+        # Rafraîchissement de l'empreinte (réécriture via load_valid_entry)
+        file_stat = temp_file.stat()
+        os.utime(temp_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+        assert cm.is_cached("test_key", str(temp_file)) is True
+        assert stat.S_IMODE(cache_file.stat().st_mode) == 0o666 & ~umask
+
     def test_is_cached_nonexistent(self, temp_cache_dir, temp_file):
         """Test détection de cache inexistant."""
         cm = CacheManager(str(temp_cache_dir))
@@ -232,6 +232,25 @@ class TestCryptoPriceAPI:
 
         assert price is None
 
+    @patch('tools.crypto_price_api.requests.get')
+    def test_get_prices_eur_single_request(self, mock_get):
+        """Test que plusieurs tickers sont valorisés en une seule requête, cache compris."""
+        mock_response = Mock()
+        mock_response.json.return_value = {'bitcoin': {'eur': 50000.0}, 'ethereum': {'eur': 3000.0}}
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        api = CryptoPriceAPI()
+        api.cache['solana_eur'] = 150.0
+
+        prices = api.get_prices_eur(['BTC', 'eth', 'SOL', 'UNKNOWN'])
+
+        assert prices == {'BTC': 50000.0, 'eth': 3000.0, 'SOL': 150.0, 'UNKNOWN': None}
+        assert api.cache['bitcoin_eur'] == 50000.0
+        # Un seul appel, uniquement pour les IDs absents du cache
+        mock_get.assert_called_once()
+        assert 'ids=bitcoin,ethereum&' in mock_get.call_args[0][0]
+
     @patch('tools.crypto_price_api.requests.get')
     def test_cache_isolation_between_methods(self, mock_get):
         """Test que le cache est partagé entre les méthodes."""
@@ -11,7 +11,7 @@ from pathlib import Path
 # Ajouter le répertoire parent (racine du projet) au path pour importer tools
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from tools.normalizer import PatrimoineNormalizer
+from tools.normalizer import PatrimoineNormalizer, _write_json
 
 def setup_logging():
     """Configure le logging"""
@@ -72,5 +72,33 @@ def main():
     
     return 0
 
+def test_write_json_orjson_differences(tmp_path):
+    """
+    Avec orjson, la sortie diffère de json.dump sur les flottants non finis (NaN → null)
+    et le format des exposants (1e16 au lieu de 1e+16) ; le reste est identique
+    """
+    import pytest
+    pytest.importorskip("orjson")
+
+    output = tmp_path / "out.json"
+    _write_json(output, {"nan": float("nan"), "grand": 1e16, "texte": "é", "valeur": 0.1})
+
+    assert output.read_text(encoding="utf-8") == (
+        '{\n  "nan": null,\n  "grand": 1e16,\n  "texte": "é",\n  "valeur": 0.1\n}'
+    )
+
+def test_write_json_respects_umask(tmp_path):
+    """Le fichier écrit garde les droits d'un open() classique (0666 & ~umask), pas ceux de mkstemp"""
+    import os
+    import stat
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    output = tmp_path / "out.json"
+    _write_json(output, {"a": 1})
+
+    assert stat.S_IMODE(output.stat().st_mode) == 0o666 & ~umask
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -16,10 +16,16 @@ PRD: Extension du système de parsing (Section 2.1.2)
 import json
 import hashlib
 import logging
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+# Umask du processus, lu une seule fois (os.umask ne se lit qu'en le remplaçant)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 class CacheManager:
     """Gère le cache des données historiques parsées."""
@@ -45,6 +51,19 @@ class CacheManager:
                 hasher.update(chunk)
         return hasher.hexdigest()
 
+    def get_file_fingerprint(self, file_path: str) -> Dict[str, int]:
+        """
+        Empreinte rapide d'un fichier (taille + mtime en ns), obtenue par un seul stat.
+
+        Args:
+            file_path: Chemin vers le fichier
+
+        Returns:
+            Dictionnaire {'file_size', 'file_mtime_ns'}
+        """
+        stat = Path(file_path).stat()
+        return {'file_size': stat.st_size, 'file_mtime_ns': stat.st_mtime_ns}
+
     def get_cache_key(self, custodian: str, file_name: str) -> str:
         """
         Génère une clé de cache unique.
@@ -73,30 +92,64 @@ class CacheManager:
         Returns:
             True si cache valide, False sinon
         """
+        return self.load_valid_entry(cache_key, file_path) is not None
+
+    def load_valid_entry(self, cache_key: str, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge une entrée de cache si elle est valide pour le fichier source (une seule lecture).
+
+        Si taille et mtime du fichier sont identiques à ceux enregistrés, le cache est
+        valide sans relire le fichier. Sinon, le hash SHA-256 tranche (fichier touché
+        mais contenu identique = cache toujours valide).
+
+        Args:
+            cache_key: Clé de cache
+            file_path: Chemin du fichier source
+
+        Returns:
+            Dictionnaire avec 'data' et '_metadata', ou None si absent/invalide
+        """
         cache_file = self.cache_dir / f"{cache_key}.json"
 
         if not cache_file.exists():
-            return False
+            return None
 
         try:
             cached_data = self.load_from_cache(cache_key)
             if not cached_data:
-                return False
+                return None
+
+            cached_metadata = cached_data.get('_metadata', {})
+
+            # Empreinte (taille, mtime) identique : fichier inchangé, pas de hash
+            fingerprint = self.get_file_fingerprint(file_path)
+            if all(cached_metadata.get(field) == value for field, value in fingerprint.items()):
+                self.logger.info(f"✓ Cache valide trouvé pour {cache_key}")
+                return cached_data
 
             # Vérifier le hash pour détecter les modifications
             current_hash = self.get_file_hash(file_path)
-            cached_hash = cached_data.get('_metadata', {}).get('file_hash', '')
+            cached_hash = cached_metadata.get('file_hash', '')
 
             if current_hash != cached_hash:
                 self.logger.info(f"Cache invalide pour {cache_key}: fichier modifié")
-                return False
+                return None
+
+            # Contenu identique mais empreinte changée (touch, checkout, copie) : mémoriser la
+            # nouvelle empreinte pour éviter de recalculer le hash aux exécutions suivantes
+            cached_metadata.update(fingerprint)
+            cached_data['_metadata'] = cached_metadata
+            try:
+                self._write_entry(cache_key, cached_data)
+            except Exception as e:
+                self.logger.warning(f"Impossible de mettre à jour l'empreinte du cache {cache_key}: {e}")
 
             self.logger.info(f"✓ Cache valide trouvé pour {cache_key}")
-            return True
+            return cached_data
 
         except Exception as e:
             self.logger.warning(f"Erreur lors de la vérification du cache {cache_key}: {e}")
-            return False
+            return None
 
     def save_to_cache(
         self,
@@ -114,13 +167,12 @@ class CacheManager:
             parsed_data: Données parsées à cacher
             metadata: Métadonnées additionnelles
         """
-        cache_file = self.cache_dir / f"{cache_key}.json"
-
         cache_entry = {
             '_metadata': {
                 'cache_key': cache_key,
                 'file_path': file_path,
                 'file_hash': self.get_file_hash(file_path),
+                **self.get_file_fingerprint(file_path),
                 'cached_at': datetime.now().isoformat(),
                 'custom_metadata': metadata or {}
             },
@@ -128,14 +180,34 @@ class CacheManager:
         }
 
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_entry, f, indent=2, ensure_ascii=False)
-
+            self._write_entry(cache_key, cache_entry)
             self.logger.info(f"✓ Données sauvegardées en cache: {cache_key}")
 
         except Exception as e:
             self.logger.error(f"Erreur lors de la sauvegarde du cache {cache_key}: {e}")
 
+    def _write_entry(self, cache_key: str, cache_entry: Dict[str, Any]) -> None:
+        """
+        Écrit une entrée de cache de façon atomique.
+
+        Écriture dans un fichier temporaire unique puis renommage atomique : les comptes
+        sont parsés en parallèle, deux écritures sur la même clé ne peuvent pas s'entremêler
+        et un lecteur voit toujours une entrée complète (données synchronisées sur disque
+        avant le renommage, y compris après un crash).
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{cache_key}.", suffix=".tmp")
+        try:
+            # mkstemp crée le fichier en 0600 : rétablir les droits d'un open() classique
+            os.fchmod(fd, 0o666 & ~_UMASK)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache_entry, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.cache_dir / f"{cache_key}.json")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
     def load_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """
         Charge des données depuis le cache.
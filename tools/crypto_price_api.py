@@ -8,7 +8,7 @@ Version: v2.1
 
 import logging
 import requests
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 
 class CryptoPriceAPI:
@@ -127,6 +127,56 @@ class CryptoPriceAPI:
             self.logger.error(f"Erreur inattendue: {e}")
             return None
 
+    def get_prices_eur(self, tickers: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Récupère le prix EUR de plusieurs cryptos en une seule requête API.
+
+        Les prix déjà en cache ne sont pas redemandés ; les nouveaux prix alimentent
+        le même cache que get_crypto_price().
+
+        Args:
+            tickers: Tickers des cryptos (BTC, ETH, VRO, etc.)
+
+        Returns:
+            Dictionnaire ticker → prix EUR (None si ticker inconnu ou erreur API)
+        """
+        ids_by_ticker = {}
+        for ticker in tickers:
+            coingecko_id = self.TICKER_TO_COINGECKO_ID.get(ticker.upper().strip())
+            if not coingecko_id:
+                self.logger.warning(f"Ticker crypto inconnu: {ticker} (pas de mapping CoinGecko)")
+            ids_by_ticker[ticker] = coingecko_id
+
+        missing_ids = sorted({
+            coingecko_id for coingecko_id in ids_by_ticker.values()
+            if coingecko_id and f"{coingecko_id}_eur" not in self.cache
+        })
+
+        if missing_ids:
+            try:
+                url = f"{self.base_url}/simple/price?ids={','.join(missing_ids)}&vs_currencies=eur"
+                response = requests.get(url, timeout=10)
+                response.raise_for_status()
+
+                data = response.json()
+                for coingecko_id in missing_ids:
+                    price = data.get(coingecko_id, {}).get('eur')
+                    if price:
+                        self.cache[f"{coingecko_id}_eur"] = float(price)
+                        self.logger.info(f"Prix {coingecko_id}/EUR récupéré: {price}")
+                    else:
+                        self.logger.error(f"Prix {coingecko_id} non trouvé dans la réponse API")
+
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"Erreur lors de la récupération des prix {missing_ids}: {e}")
+            except Exception as e:
+                self.logger.error(f"Erreur inattendue: {e}")
+
+        return {
+            ticker: self.cache.get(f"{coingecko_id}_eur") if coingecko_id else None
+            for ticker, coingecko_id in ids_by_ticker.items()
+        }
+
     def convert_crypto_to_eur(self, ticker: str, amount: float) -> Optional[float]:
         """
         Convertit un montant de crypto en EUR (méthode générique).
@@ -8,11 +8,104 @@ import json
 import logging
 import re
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict
 
 from bs4 import BeautifulSoup
 
+# Balise <link> vers la feuille de style externe du template
+_CSS_LINK_RE = re.compile(
+    r"""<link\b(?=[^>]*\brel=["']stylesheet["'])[^>]*\bhref=["']rapport\.css["'][^>]*>"""
+)
+
+
+# Tables label → classe CSS des badges, évaluées dans l'ordre (première sous-chaîne trouvée)
+# Classes : low = vert (bon), mid = orange (attention), high = rouge clair (alerte), crit = rouge foncé
+_BADGE_TABLES = {
+    "diversification": (
+        ("excellente", "low"),
+        ("très bien", "low"),
+        ("bonne", "low"),
+        ("bon équilibre", "low"),
+        ("modérée", "mid"),
+        ("concentration modérée", "mid"),
+        ("forte", "high"),
+        ("concentration élevée", "high"),
+        ("critique", "crit"),
+        ("concentration critique", "crit"),
+    ),
+    "resilience": (
+        ("résilient", "low"),
+        ("solide", "low"),
+        ("vulnérable", "mid"),
+        ("fragile", "high"),
+        ("critique", "crit"),
+    ),
+    "fiscal": (
+        ("excellente", "low"),
+        ("bonne", "low"),
+        ("moyenne", "mid"),
+        ("sous-optimisée", "high"),
+        ("sous-optimisé", "high"),
+        ("défavorable", "crit"),
+    ),
+    "growth": (
+        ("excellent", "low"),
+        ("bon", "low"),
+        ("modéré", "mid"),
+        ("limité", "high"),
+        ("très faible", "crit"),
+        ("faible", "crit"),
+    ),
+    "liquidity": (
+        ("excellente", "low"),
+        ("bonne", "low"),
+        ("acceptable", "mid"),
+        ("fragile", "high"),
+        ("critique", "crit"),
+    ),
+    "alert_severity": (
+        ("critique", "crit"),
+        ("élevé", "high"),
+        ("modéré", "mid"),
+    ),
+    "markowitz_improvement": (
+        ("forte", "high"),  # Forte amélioration nécessaire
+        ("modérée", "mid"),
+        ("marginale", "low"),
+        ("proche de l'optimal", "low"),
+        ("optimal", "low"),
+    ),
+}
+
+# Classe par défaut quand aucun mot-clé ne correspond
+_BADGE_DEFAULTS = {"alert_severity": "low"}
+
+# Badges post-traités : data-field → table de classification
+_BADGE_FIELDS = (
+    ("div_label", "diversification"),
+    ("res_label", "resilience"),
+    ("liq_label", "liquidity"),
+    ("fisc_label", "fiscal"),
+    ("growth_label", "growth"),
+    ("concentration_alert_severite", "alert_severity"),
+    ("markowitz_improvement_level", "markowitz_improvement"),
+)
+
+_BADGE_LEVEL_CLASSES = ("high", "mid", "low", "crit")
+
+
+@lru_cache(maxsize=4)
+def _compiled_style(css_path: str, mtime_ns: int) -> str:
+    """
+    Retourne la balise <style> complète pour un fichier CSS
+    Mise en cache par (chemin, mtime) : relue uniquement si le fichier change
+    """
+    css_content = Path(css_path).read_text(encoding="utf-8")
+    return f"<style>{css_content}</style>"
+
 
 class ReportGenerator:
     """
@@ -39,11 +132,12 @@ class ReportGenerator:
             raise FileNotFoundError(f"Template introuvable : {template_path}")
 
         template_html = template_path.read_text(encoding="utf-8")
-        soup = BeautifulSoup(template_html, "lxml")
 
-        # 1.5. Inline CSS
+        # 1.5. Inline CSS (dans le texte du template, avant le parsing)
         self.logger.info("Incorporation du CSS...")
-        self._inline_css(soup)
+        template_html = self._inline_css(template_html)
+
+        soup = BeautifulSoup(template_html, "lxml")
 
         # 2. Inject simple fields
         self.logger.info("Injection données...")
@@ -324,128 +418,20 @@ class ReportGenerator:
                         else:
                             el.string = str(value)
 
-        # Post-traitement : Appliquer la classe CSS au badge div_label
-        div_label_elements = soup.find_all(attrs={"data-field": "div_label"})
-        for badge_el in div_label_elements:
-            label_text = badge_el.string if badge_el.string else ""
-            badge_class = self._get_diversification_badge_class(label_text)
-
-            if badge_el.has_attr("class"):
-                badge_classes = [
-                    c
-                    for c in badge_el["class"]
-                    if c not in ["high", "mid", "low", "crit"]
-                ]
-                badge_classes.append(badge_class)
-                badge_el["class"] = badge_classes
-            else:
-                badge_el["class"] = ["badge", badge_class]
-
-        # Post-traitement : Appliquer la classe CSS au badge res_label
-        res_label_elements = soup.find_all(attrs={"data-field": "res_label"})
-        for badge_el in res_label_elements:
-            label_text = badge_el.string if badge_el.string else ""
-            badge_class = self._get_resilience_badge_class(label_text)
-
-            if badge_el.has_attr("class"):
-                badge_classes = [
-                    c
-                    for c in badge_el["class"]
-                    if c not in ["high", "mid", "low", "crit"]
-                ]
-                badge_classes.append(badge_class)
-                badge_el["class"] = badge_classes
-            else:
-                badge_el["class"] = ["badge", badge_class]
-
-        # Post-traitement : Appliquer la classe CSS au badge liq_label
-        liq_label_elements = soup.find_all(attrs={"data-field": "liq_label"})
-        for badge_el in liq_label_elements:
-            label_text = badge_el.string if badge_el.string else ""
-            badge_class = self._get_liquidity_badge_class(label_text)
-
-            if badge_el.has_attr("class"):
-                badge_classes = [
-                    c
-                    for c in badge_el["class"]
-                    if c not in ["high", "mid", "low", "crit"]
-                ]
-                badge_classes.append(badge_class)
-                badge_el["class"] = badge_classes
-            else:
-                badge_el["class"] = ["badge", badge_class]
+        # Post-traitement : Appliquer la classe CSS aux badges de label
+        for field_name, kind in _BADGE_FIELDS:
+            for badge_el in soup.find_all(attrs={"data-field": field_name}):
+                label_text = badge_el.string if badge_el.string else ""
+                badge_class = self._classify(kind, label_text)
 
-        # Post-traitement : Appliquer la classe CSS au badge fisc_label
-        fisc_label_elements = soup.find_all(attrs={"data-field": "fisc_label"})
-        for badge_el in fisc_label_elements:
-            label_text = badge_el.string if badge_el.string else ""
-            badge_class = self._get_fiscal_badge_class(label_text)
-
-            if badge_el.has_attr("class"):
-                badge_classes = [
-                    c
-                    for c in badge_el["class"]
-                    if c not in ["high", "mid", "low", "crit"]
-                ]
-                badge_classes.append(badge_class)
-                badge_el["class"] = badge_classes
-            else:
-                badge_el["class"] = ["badge", badge_class]
-
-        # Post-traitement : Appliquer la classe CSS au badge growth_label
-        growth_label_elements = soup.find_all(attrs={"data-field": "growth_label"})
-        for badge_el in growth_label_elements:
-            label_text = badge_el.string if badge_el.string else ""
-            badge_class = self._get_growth_badge_class(label_text)
-
-            if badge_el.has_attr("class"):
-                badge_classes = [
-                    c
-                    for c in badge_el["class"]
-                    if c not in ["high", "mid", "low", "crit"]
-                ]
-                badge_classes.append(badge_class)
-                badge_el["class"] = badge_classes
-            else:
-                badge_el["class"] = ["badge", badge_class]
-
-        # Post-traitement : Appliquer la classe CSS au badge concentration_alert_severite
-        concentration_severity_elements = soup.find_all(
-            attrs={"data-field": "concentration_alert_severite"}
-        )
-        for badge_el in concentration_severity_elements:
-            label_text = badge_el.string if badge_el.string else ""
-            badge_class = self._get_alert_severity_badge_class(label_text)
-
-            if badge_el.has_attr("class"):
-                badge_classes = [
-                    c
-                    for c in badge_el["class"]
-                    if c not in ["high", "mid", "low", "crit"]
-                ]
-                badge_classes.append(badge_class)
-                badge_el["class"] = badge_classes
-            else:
-                badge_el["class"] = ["badge", badge_class]
-
-        # Post-traitement : Appliquer la classe CSS au badge markowitz_improvement_level
-        markowitz_improvement_elements = soup.find_all(
-            attrs={"data-field": "markowitz_improvement_level"}
-        )
-        for badge_el in markowitz_improvement_elements:
-            label_text = badge_el.string if badge_el.string else ""
-            badge_class = self._get_markowitz_improvement_badge_class(label_text)
-
-            if badge_el.has_attr("class"):
-                badge_classes = [
-                    c
-                    for c in badge_el["class"]
-                    if c not in ["high", "mid", "low", "crit"]
-                ]
-                badge_classes.append(badge_class)
-                badge_el["class"] = badge_classes
-            else:
-                badge_el["class"] = ["badge", badge_class]
+                if badge_el.has_attr("class"):
+                    badge_classes = [
+                        c for c in badge_el["class"] if c not in _BADGE_LEVEL_CLASSES
+                    ]
+                    badge_classes.append(badge_class)
+                    badge_el["class"] = badge_classes
+                else:
+                    badge_el["class"] = ["badge", badge_class]
 
         self.logger.debug(f"  → {len(mappings)} champs simples injectés")
 
@@ -868,36 +854,34 @@ class ReportGenerator:
         script_tag.string = new_script
         self.logger.debug(f"  → Données graphique radar injectées: {scores_array}")
 
-    def _inline_css(self, soup: BeautifulSoup):
+    def _inline_css(self, template_html: str) -> str:
         """
-        Incorpore le CSS externe directement dans le HTML
+        Incorpore le CSS externe directement dans le HTML du template
         Remplace <link rel="stylesheet" href="rapport.css" /> par <style>...</style>
+        L'incorporation se fait sur le texte brut, avant le parsing BeautifulSoup
         """
         # Trouver la balise link vers rapport.css
-        link_tag = soup.find("link", attrs={"rel": "stylesheet", "href": "rapport.css"})
+        link_match = _CSS_LINK_RE.search(template_html)
 
-        if not link_tag:
+        if not link_match:
             self.logger.warning("Balise <link> vers rapport.css introuvable")
-            return
+            return template_html
 
         # Construire le chemin vers le fichier CSS
         css_path = Path(self.config["paths"]["templates"]) / "rapport.css"
 
         if not css_path.exists():
             self.logger.warning(f"Fichier CSS introuvable : {css_path}")
-            return
+            return template_html
 
-        # Lire le contenu du CSS
-        css_content = css_path.read_text(encoding="utf-8")
+        # Balise <style> en cache (relue seulement si le CSS a changé)
+        style_html = _compiled_style(str(css_path), css_path.stat().st_mtime_ns)
 
-        # Créer une nouvelle balise <style>
-        style_tag = soup.new_tag("style")
-        style_tag.string = css_content
+        self.logger.debug(f"  → CSS incorporé ({len(style_html)} caractères)")
 
         # Remplacer la balise <link> par <style>
-        link_tag.replace_with(style_tag)
-
-        self.logger.debug(f"  → CSS incorporé ({len(css_content)} caractères)")
+        start, end = link_match.span()
+        return template_html[:start] + style_html + template_html[end:]
 
     def _format_currency(self, value: float) -> str:
         """
@@ -1010,66 +994,35 @@ class ReportGenerator:
             # Par défaut: moyenne
             return "mid"
 
+    def _classify(self, kind: str, label: str) -> str:
+        """
+        Retourne classe CSS d'un badge via la table _BADGE_TABLES[kind]
+        Première sous-chaîne trouvée dans le label (insensible à la casse),
+        sinon _BADGE_DEFAULTS[kind] ("mid" par défaut)
+        """
+        label_lower = label.lower()
+        return next(
+            (css for keyword, css in _BADGE_TABLES[kind] if keyword in label_lower),
+            _BADGE_DEFAULTS.get(kind, "mid"),
+        )
+
     def _get_diversification_badge_class(self, label: str) -> str:
         """
         Retourne classe CSS selon le label de qualité de diversification
-        Mapping des labels vers les classes CSS
         """
-        label_lower = label.lower()
-        if "excellente" in label_lower or "très bien" in label_lower:
-            return "low"  # Vert = bon
-        elif "bonne" in label_lower or "bon équilibre" in label_lower:
-            return "low"  # Vert = bon
-        elif "modérée" in label_lower or "concentration modérée" in label_lower:
-            return "mid"  # Orange = attention
-        elif "forte" in label_lower or "concentration élevée" in label_lower:
-            return "high"  # Rouge clair = alerte
-        elif "critique" in label_lower or "concentration critique" in label_lower:
-            return "crit"  # Rouge foncé = critique
-        else:
-            # Par défaut: mid
-            return "mid"
+        return self._classify("diversification", label)
 
     def _get_resilience_badge_class(self, label: str) -> str:
         """
         Retourne classe CSS selon le label de qualité de résilience
-        Mapping des labels vers les classes CSS
         """
-        label_lower = label.lower()
-        if "résilient" in label_lower:
-            return "low"  # Vert = bon
-        elif "solide" in label_lower:
-            return "low"  # Vert = bon
-        elif "vulnérable" in label_lower:
-            return "mid"  # Orange = attention
-        elif "fragile" in label_lower:
-            return "high"  # Rouge clair = alerte
-        elif "critique" in label_lower:
-            return "crit"  # Rouge foncé = critique
-        else:
-            # Par défaut: mid
-            return "mid"
+        return self._classify("resilience", label)
 
     def _get_fiscal_badge_class(self, label: str) -> str:
         """
         Retourne classe CSS selon le label de qualité fiscal
-        Mapping des labels vers les classes CSS
         """
-        label_lower = label.lower()
-
-        if "excellente" in label_lower:
-            return "low"  # Vert = bon
-        elif "bonne" in label_lower:
-            return "low"  # Vert = bon
-        elif "moyenne" in label_lower:
-            return "mid"  # Orange = attention
-        elif "sous-optimisée" in label_lower or "sous-optimisé" in label_lower:
-            return "high"  # Rouge clair = alerte
-        elif "défavorable" in label_lower:
-            return "crit"  # Rouge foncé = critique
-        else:
-            # Par défaut: mid
-            return "mid"
+        return self._classify("fiscal", label)
 
     def _format_fiscal_bonuses(self, data: dict) -> str:
         """
@@ -1151,23 +1104,8 @@ class ReportGenerator:
     def _get_growth_badge_class(self, label: str) -> str:
         """
         Retourne classe CSS selon le label de qualité croissance
-        Mapping des labels vers les classes CSS
         """
-        label_lower = label.lower()
-
-        if "excellent" in label_lower:
-            return "low"  # Vert = bon
-        elif "bon" in label_lower:
-            return "low"  # Vert = bon
-        elif "modéré" in label_lower:
-            return "mid"  # Orange = attention
-        elif "limité" in label_lower:
-            return "high"  # Rouge clair = alerte
-        elif "très faible" in label_lower or "faible" in label_lower:
-            return "crit"  # Rouge foncé = critique
-        else:
-            # Par défaut: mid
-            return "mid"
+        return self._classify("growth", label)
 
     def _format_growth_optimal_range(self, data: dict) -> str:
         """
@@ -1219,23 +1157,8 @@ class ReportGenerator:
     def _get_liquidity_badge_class(self, label: str) -> str:
         """
         Retourne classe CSS selon le label de qualité de liquidité
-        Mapping des labels vers les classes CSS
         """
-        label_lower = label.lower()
-
-        if "excellente" in label_lower:
-            return "low"  # Vert = bon
-        elif "bonne" in label_lower:
-            return "low"  # Vert = bon
-        elif "acceptable" in label_lower:
-            return "mid"  # Orange = attention
-        elif "fragile" in label_lower:
-            return "high"  # Rouge clair = alerte
-        elif "critique" in label_lower:
-            return "crit"  # Rouge foncé = critique
-        else:
-            # Par défaut: mid
-            return "mid"
+        return self._classify("liquidity", label)
 
     def _format_liquidity_complete_note(self, data: dict) -> str:
         """
@@ -1384,45 +1307,38 @@ class ReportGenerator:
             profil_actif_technique, profil_actif_technique.capitalize()
         )
 
-        # Construire la synthèse
-        parts = []
-
         # Prénom NOM + âge
         if prenom and nom:
             full_name = f"{prenom} {nom.upper()}"
-            if age:
-                parts.append(f"{full_name} • {age} ans")
-            else:
-                parts.append(full_name)
-        elif age:
-            parts.append(f"{age} ans")
+            name_part = f"{full_name} • {age} ans" if age else full_name
+        else:
+            name_part = f"{age} ans" if age else ""
 
         # Situation familiale
-        if situation:
-            situation_text = situation
-            if enfants > 0:
-                situation_text += f", {enfants} enfant" + ("s" if enfants > 1 else "")
-            parts.append(situation_text)
+        situation_part = situation
+        if situation and enfants > 0:
+            situation_part += f", {enfants} enfant" + ("s" if enfants > 1 else "")
 
         # Type d'investisseur (maintenant basé sur config/analysis.yaml)
-        if type_inv:
-            parts.append(f"Profil {type_inv}")
+        type_part = f"Profil {type_inv}" if type_inv else ""
 
         # Profession/statut
         if profession and statut:
-            parts.append(f"{profession} ({statut})")
-        elif profession:
-            parts.append(profession)
-        elif statut:
-            parts.append(statut)
+            prof_part = f"{profession} ({statut})"
+        else:
+            prof_part = profession or statut
 
         # Revenu (optionnel, seulement si présent et significatif)
-        if revenu > 0:
-            parts.append(f"{self._format_currency(revenu)}/mois")
+        revenu_part = f"{self._format_currency(revenu)}/mois" if revenu > 0 else ""
 
         # Joindre avec des séparateurs
-        if len(parts) > 0:
-            return " • ".join(parts)
+        synthese = " • ".join(
+            p
+            for p in (name_part, situation_part, type_part, prof_part, revenu_part)
+            if p
+        )
+        if synthese:
+            return synthese
         else:
             return "Analyse approfondie • Recommandations • Synthèse"
 
@@ -1475,8 +1391,17 @@ class ReportGenerator:
             elif "Fiscale" in categorie or "fiscal" in categorie.lower():
                 principaux_risques.append("optimisation fiscale")
 
-        # Enlever les doublons et limiter à 2-3 risques
-        principaux_risques = list(dict.fromkeys(principaux_risques))[:3]
+        # Enlever les doublons et limiter à 2-3 risques (arrêt dès 3 risques distincts)
+        seen = set()
+        dedup = []
+        for r in principaux_risques:
+            if r in seen:
+                continue
+            seen.add(r)
+            dedup.append(r)
+            if len(dedup) == 3:
+                break
+        principaux_risques = dedup
 
         # Construire le commentaire
         if principaux_risques:
@@ -1572,18 +1497,22 @@ class ReportGenerator:
             return None
 
         # Trier par sévérité décroissante
-        alerts.sort(key=lambda x: (-x["severity"], -x["pct"]))
+        alerts.sort(key=itemgetter("severity", "pct"), reverse=True)
 
         # Générer le message d'alerte pour les alertes les plus importantes
         alert_messages = []
 
-        for alert in alerts[:2]:  # Max 2 alertes principales
+        alerts_top = alerts[:2]  # Max 2 alertes principales
+
+        for alert in alerts_top:
             pct = alert["pct"]
             nom = alert["nom"]
-            alert_type = alert["type"]
+            # Les types sont de la forme "etablissement_*" ou "juridiction_*"
+            is_etab = alert["type"].startswith("etablissement")
+            is_critique = alert["severity"] >= 3
 
-            if "critique" in alert_type:
-                if "etablissement" in alert_type:
+            if is_critique:
+                if is_etab:
                     alert_messages.append(
                         f"<strong>⚠️ Concentration critique :</strong> {pct:.1f}% du patrimoine "
                         f"exposé sur <strong>{nom}</strong>"
@@ -1594,7 +1523,7 @@ class ReportGenerator:
                         f"exposé au <strong>{nom}</strong>"
                     )
             else:  # élevé
-                if "etablissement" in alert_type:
+                if is_etab:
                     alert_messages.append(
                         f"<strong>⚠️ Concentration élevée :</strong> {pct:.1f}% du patrimoine "
                         f"concentré sur <strong>{nom}</strong>"
@@ -1894,7 +1823,7 @@ class ReportGenerator:
                 )
 
         # Trier par sévérité décroissante
-        alerts.sort(key=lambda x: (-x["severity"], -x["pct"]))
+        alerts.sort(key=itemgetter("severity", "pct"), reverse=True)
 
         return alerts
 
@@ -2006,28 +1935,10 @@ class ReportGenerator:
         """
         Retourne classe CSS selon le label de sévérité de l'alerte
         """
-        label_lower = label.lower()
-        if "critique" in label_lower:
-            return "crit"  # Rouge foncé
-        elif "élevé" in label_lower:
-            return "high"  # Rouge clair
-        elif "modéré" in label_lower:
-            return "mid"  # Orange
-        else:
-            return "low"  # Vert
+        return self._classify("alert_severity", label)
 
     def _get_markowitz_improvement_badge_class(self, label: str) -> str:
         """
         Retourne classe CSS selon le niveau d'amélioration Markowitz
         """
-        label_lower = label.lower()
-        if "forte" in label_lower:
-            return "high"  # Rouge clair = forte amélioration nécessaire
-        elif "modérée" in label_lower:
-            return "mid"  # Orange = amélioration modérée
-        elif "marginale" in label_lower:
-            return "low"  # Vert = bon
-        elif "proche de l'optimal" in label_lower or "optimal" in label_lower:
-            return "low"  # Vert = excellent
-        else:
-            return "mid"  # Par défaut : orange
+        return self._classify("markowitz_improvement", label)
@@ -3,16 +3,29 @@ Module de normalisation des fichiers sources (v2.1)
 Architecture manifest-driven avec parsers pluggables et sections manuelles
 """
 
+import concurrent.futures
+import functools
 import json
 import logging
+import math
+import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
-import glob
+from typing import Dict, Any, List, Callable
 import re
-import fnmatch
+import tempfile
 import yaml
 
+try:
+    import orjson
+except ImportError:  # orjson optionnel : repli sur json (stdlib)
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as _YamlLoader  # Bindings libyaml (C) si PyYAML compilé avec
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Import du registry de parsers
 from tools.parsers.registry import ParserRegistry
 from tools.parsers.base_parser import ParsingError
@@ -23,13 +36,195 @@ from tools.cache_manager import CacheManager
 # Import de l'API de prix crypto
 from tools.crypto_price_api import CryptoPriceAPI
 
-# Import des parsers concrets (pour auto-register)
-from tools.parsers.credit_agricole import CreditAgricolePEA2025Parser, CreditAgricoleAV2LignesParser
-from tools.parsers.generic import GenericCSVParser
-from tools.parsers.bitstack import BitstackTransactionHistoryParser
-from tools.parsers.bforbank import BforBankCTO2025Parser
-from tools.parsers.crypcool import CrypCoolTransactionAggregator2025Parser, CrypCoolTransactionAggregator2026Parser
-from tools.parsers.boursobank import BoursoBankPER2025Parser
+
+# Umask du processus, lu une seule fois (os.umask ne se lit qu'en le remplaçant)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Décode un document JSON (orjson si disponible, sinon json stdlib)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _write_json(path: Path, data: Any):
+    """
+    Écrit data en JSON UTF-8 indenté dans path, de façon atomique.
+
+    Le document est écrit dans un fichier temporaire voisin (nom unique via mkstemp),
+    synchronisé sur disque puis renommé (os.replace) : un crash en cours d'écriture
+    laisse l'ancien fichier intact, jamais un JSON tronqué.
+
+    orjson (si disponible) produit le document en un seul buffer bytes écrit d'un bloc ;
+    le repli json stdlib encode en flux vers le fichier (pas de copie str complète en mémoire),
+    via un tampon de 64 Ko pour regrouper les nombreux petits fragments de json.dump.
+    Les deux sorties ne sont pas identiques octet pour octet : orjson écrit NaN/Infinity
+    en null et les exposants sans signe (1e16 au lieu de 1e+16).
+    """
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        except TypeError:
+            # Type non supporté par orjson (ex: entier > 64 bits) : repli sur json
+            pass
+
+    # Nom temporaire unique : deux écritures concurrentes vers la même cible ne partagent
+    # jamais le même fichier intermédiaire
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        # mkstemp crée le fichier en 0600 : rétablir les droits d'un open() classique
+        os.fchmod(fd, 0o666 & ~_UMASK)
+        if payload is not None:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8', buffering=64 * 1024) as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# Règles de validation du manifest (v2.1), construites une seule fois à l'import
+_MANIFEST_VERSIONS = ("2.1.0", "2.0.0")  # Support legacy 2.0.0 temporairement
+_PROFIL_SECTIONS = ("identite", "professionnel", "investissement")
+_VALID_PROFILS = ["dynamique", "equilibre", "prudent", "default"]
+_ASSET_SECTIONS = ("comptes_titres", "liquidites", "crypto", "metaux_precieux", "immobilier", "obligations")
+_COMPTE_TITRES_REQUIRED = ("id", "custodian", "type_compte", "parser_strategy")
+
+# Champs optionnels d'un compte parsé recopiés dans l'entrée compte
+_COMPTE_OPTIONAL_FIELDS = ("positions", "fonds", "solde_especes", "source_file")
+
+# Devises crypto valorisées sans appel API : EUR (1:1) et USD/stablecoins (taux approximatif)
+_FIAT_EUR_DEVISES = frozenset({"EUR", "EURO"})
+_USD_STABLE_DEVISES = frozenset({"USD", "USDT", "USDC", "DAI", "BUSD"})
+_FIAT_STABLE_DEVISES = _FIAT_EUR_DEVISES | _USD_STABLE_DEVISES
+
+# Année dans un nom de fichier source (ex: "[BIT] - 2022.csv"), pour le cache des années passées
+_YEAR_RE = re.compile(r'(\d{4})')
+
+# Métadonnées d'un établissement de comptes titres absent de etablissements_financiers.yaml
+# (partagé en lecture seule, recopié dans chaque entrée établissement)
+_ETAB_FIELD_DEFAULTS = {
+    "juridiction": "France",
+    "juridiction_pays": "France",
+    "type_etablissement": "Banque",
+    "garantie_depots": "N/A",
+    "exposition_sapin_2": "NON",
+    "exposition_risque_france": "MOYENNE",
+}
+
+# Métadonnées des établissements créés depuis une section manuelle (liquidités, obligations) :
+# (champ, valeur par défaut), lus dans le bloc "metadata" de l'actif
+_MANUAL_ETAB_META_DEFAULTS = (
+    ("juridiction", "France"),
+    ("juridiction_pays", "France"),
+    ("garantie_depots", "N/A"),
+    ("exposition_sapin_2", "NON"),
+    ("exposition_risque_france", "FAIBLE"),
+)
+
+
+def _canonical_compte_def(compte_def: dict) -> dict:
+    """
+    Résout une fois les champs legacy d'une définition de compte du manifest.
+
+    Retourne une copie superficielle où 'etablissement' (custodian, sinon etablissement
+    legacy), 'type_compte' (sinon type_actif, défaut Crypto) et 'source' (source_file,
+    sinon source_pattern) sont toujours présents : le code de parsing lit ces clés
+    directement au lieu de réévaluer les chaînes de repli à chaque accès (et à chaque
+    fichier d'un source_pattern).
+    """
+    canonical = dict(compte_def)
+    canonical["etablissement"] = compte_def.get("custodian", compte_def.get("etablissement"))
+    canonical["type_compte"] = compte_def.get("type_compte", compte_def.get("type_actif", "Crypto"))
+    canonical["source"] = compte_def.get("source_file", compte_def.get("source_pattern", ""))
+    return canonical
+
+
+@functools.lru_cache(maxsize=8)
+def _load_etablissements_meta(path: str, mtime_ns: int) -> dict:
+    """
+    Charge la section 'etablissements' de etablissements_financiers.yaml.
+
+    Mis en cache par (chemin, mtime) : relu uniquement si le fichier change.
+    Le dict retourné est partagé entre les appels et ne doit pas être modifié.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        metadata = yaml.load(f, Loader=_YamlLoader)
+    return metadata.get("etablissements", {})
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_glob(pattern: str) -> Callable[[str], bool]:
+    """
+    Compile un pattern de fichier en prédicat sur le nom (seul * est un joker, [] restent littéraux).
+
+    Patterns triviaux traités par comparaison de chaînes : sans * (égalité) ou avec
+    un seul * (préfixe + suffixe, ex: "[BIT] - *.csv"). Les autres passent par une regex.
+    Mis en cache par pattern : une seule analyse par pattern et par processus.
+    """
+    star_count = pattern.count('*')
+    if star_count == 0:
+        return pattern.__eq__
+    if star_count == 1:
+        prefix, suffix = pattern.split('*')
+        min_len = len(prefix) + len(suffix)
+        return lambda name: len(name) >= min_len and name.startswith(prefix) and name.endswith(suffix)
+
+    # Échapper tous les caractères spéciaux puis remplacer \* (échappé) par .* (wildcard regex)
+    regex = re.compile(re.escape(pattern).replace(r'\*', '.*'))
+    return lambda name: regex.fullmatch(name) is not None
+
+
+# Champs d'un établissement lus dans etablissements_financiers.yaml (champ, clé yaml, défaut)
+_ETAB_META_MAPPING = (
+    ("juridiction", "juridiction_principale", "France"),
+    ("juridiction_pays", "pays", "France"),
+    ("type_etablissement", "type", "Banque"),
+    ("garantie_depots", "garantie_depots", "N/A"),
+    ("exposition_sapin_2", "exposition_sapin_2", "NON"),
+    ("exposition_risque_france", "exposition_risque_france", "MOYENNE"),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_etablissements_fields(path: str, mtime_ns: int) -> dict:
+    """
+    Pré-calcule, par code établissement, les champs de son entrée établissement.
+
+    Même clé de cache que _load_etablissements_meta : recalculé uniquement si le
+    fichier change. Les dicts retournés sont partagés et ne doivent pas être modifiés.
+    """
+    return {
+        code: {field: meta.get(key, default) for field, key, default in _ETAB_META_MAPPING}
+        for code, meta in _load_etablissements_meta(path, mtime_ns).items()
+    }
+
+
+# Parsers disponibles : strategy_name -> "module:Classe". Importés au premier usage par le
+# registry (pandas, pdfplumber, openpyxl... ne sont chargés que si un fichier les requiert)
+_PARSER_PATHS = {
+    "credit_agricole.pea.v2025": "tools.parsers.credit_agricole:CreditAgricolePEA2025Parser",
+    "credit_agricole.av.v2_lignes": "tools.parsers.credit_agricole:CreditAgricoleAV2LignesParser",
+    "generic.csv.flexible": "tools.parsers.generic:GenericCSVParser",
+    "bitstack.transaction_history.v2025": "tools.parsers.bitstack:BitstackTransactionHistoryParser",
+    "bforbank.cto.v2025": "tools.parsers.bforbank:BforBankCTO2025Parser",
+    "crypcool.csv.v2025": "tools.parsers.crypcool:CrypCoolTransactionAggregator2025Parser",
+    "crypcool.csv.v2026": "tools.parsers.crypcool:CrypCoolTransactionAggregator2026Parser",
+    "boursobank.per.v2025": "tools.parsers.boursobank:BoursoBankPER2025Parser",
+}
 
 
 class PatrimoineNormalizer:
@@ -39,30 +234,32 @@ class PatrimoineNormalizer:
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        # Chemins dérivés de la configuration, construits une seule fois
+        self._sources_dir = Path(config["paths"]["sources"])
+        self._generated_dir = Path(config["paths"]["generated"])
+        self._manifest_path = self._sources_dir / config["normalizer"]["input_file"]
+        self._output_path = self._generated_dir / config["normalizer"]["output_file"]
+        # Chemin absolu canonique de sources/ pour les contrôles anti path traversal
+        self._sources_resolved = os.path.realpath(self._sources_dir)
+
         # Initialiser le registry et enregistrer les parsers
         self.parser_registry = ParserRegistry()
         self._register_parsers()
 
         # Initialiser le gestionnaire de cache
         self.cache_manager = CacheManager(
-            cache_dir=str(Path(self.config["paths"]["generated"]) / "cache")
+            cache_dir=str(self._generated_dir / "cache")
         )
 
         # Initialiser l'API de prix crypto
         self.crypto_api = CryptoPriceAPI()
 
     def _register_parsers(self):
-        """Enregistre tous les parsers disponibles"""
-        self.parser_registry.register(CreditAgricolePEA2025Parser)
-        self.parser_registry.register(CreditAgricoleAV2LignesParser)
-        self.parser_registry.register(GenericCSVParser)
-        self.parser_registry.register(BitstackTransactionHistoryParser)
-        self.parser_registry.register(BforBankCTO2025Parser)
-        self.parser_registry.register(CrypCoolTransactionAggregator2025Parser)
-        self.parser_registry.register(CrypCoolTransactionAggregator2026Parser)
-        self.parser_registry.register(BoursoBankPER2025Parser)
-
-        self.logger.info(f"Parsers enregistrés : {', '.join(self.parser_registry.list_parsers())}")
+        """Enregistre tous les parsers disponibles (import différé au premier usage)"""
+        for strategy_name, dotted_path in _PARSER_PATHS.items():
+            self.parser_registry.register_lazy(strategy_name, dotted_path)
+
+        self.logger.info("Parsers enregistrés : %s", ', '.join(self.parser_registry.list_parsers()))
 
     def normalize(self) -> dict:
         """Point d'entrée principal de normalisation (v2.1)"""
@@ -81,28 +278,24 @@ class PatrimoineNormalizer:
 
         # 4. Parser chaque compte titres via stratégie appropriée
         comptes_titres = manifest.get("patrimoine", {}).get("comptes_titres", [])
-        self.logger.info(f"Parsing {len(comptes_titres)} comptes titres...")
+        self.logger.info("Parsing %s comptes titres...", len(comptes_titres))
         comptes_parsed = self._parse_all_comptes(comptes_titres)
 
         # 5. Enrichir avec métadonnées établissements
         self.logger.info("Enrichissement métadonnées établissements...")
-        self._enrich_etablissements_metadata(comptes_parsed)
+        etab_fields_by_code = self._enrich_etablissements_metadata(comptes_parsed)
 
-        # 6. Construire JSON normalisé (intègre sections manuelles)
+        # 6. Construire JSON normalisé (intègre sections manuelles, totaux calculés au fil de l'eau)
         self.logger.info("Construction patrimoine_input.json...")
-        data = self._build_normalized_json(profil, comptes_parsed, manifest)
-
-        # 7. Calculer totaux
-        self.logger.info("Calcul totaux par catégorie...")
-        self._calculate_totals(data)
+        data = self._build_normalized_json(profil, comptes_parsed, manifest, etab_fields_by_code)
 
-        # 8. Valider données finales
+        # 7. Valider données finales
         self.logger.info("Validation données finales...")
         self._validate_normalized_data(data)
 
-        # 9. Sauvegarder JSON
-        output_path = Path(self.config["paths"]["generated"]) / self.config["normalizer"]["output_file"]
-        self.logger.info(f"Sauvegarde {output_path}...")
+        # 8. Sauvegarder JSON
+        output_path = self._output_path
+        self.logger.info("Sauvegarde %s...", output_path)
         self._save_json(data, output_path)
 
         # Nettoyer le cache si nécessaire (limite: 100 MB)
@@ -113,7 +306,7 @@ class PatrimoineNormalizer:
 
     def _load_manifest(self) -> dict:
         """Charge manifest.json"""
-        manifest_path = Path(self.config["paths"]["sources"]) / self.config["normalizer"]["input_file"]
+        manifest_path = self._manifest_path
 
         if not manifest_path.exists():
             raise FileNotFoundError(
@@ -121,10 +314,9 @@ class PatrimoineNormalizer:
                 f"Utilisez 'python tools/generate_manifest.py' pour le générer depuis patrimoine.md"
             )
 
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
+        manifest = _json_loads(manifest_path.read_bytes())
 
-        self.logger.info(f"Manifest chargé : version {manifest.get('version')}")
+        self.logger.info("Manifest chargé : version %s", manifest.get('version'))
         return manifest
 
     def _validate_manifest(self, manifest: dict):
@@ -133,47 +325,41 @@ class PatrimoineNormalizer:
 
         # Version
         version = manifest.get("version")
-        if version not in ["2.1.0", "2.0.0"]:  # Support legacy 2.0.0 temporairement
+        if version not in _MANIFEST_VERSIONS:
             errors.append(f"Version manifest invalide : {version} (attendue: 2.1.0)")
 
         # Profil investisseur requis
-        if "profil_investisseur" not in manifest:
+        profil = manifest.get("profil_investisseur")
+        if profil is None:
             errors.append("Section profil_investisseur manquante")
         else:
-            profil = manifest["profil_investisseur"]
-
             # Sous-sections requises
-            required_sections = ["identite", "professionnel", "investissement"]
-            for section in required_sections:
+            for section in _PROFIL_SECTIONS:
                 if section not in profil:
                     errors.append(f"Section profil_investisseur.{section} manquante")
 
             # profil_risque requis
-            if "investissement" in profil:
-                if "profil_risque" not in profil["investissement"]:
+            investissement = profil.get("investissement")
+            if investissement is not None:
+                if "profil_risque" not in investissement:
                     errors.append("profil_investisseur.investissement.profil_risque manquant")
                 else:
-                    profil_risque = profil["investissement"]["profil_risque"]
-                    valid_profiles = ["dynamique", "equilibre", "prudent", "default"]
-                    if profil_risque not in valid_profiles:
-                        errors.append(f"profil_risque '{profil_risque}' invalide. Valeurs: {valid_profiles}")
+                    profil_risque = investissement["profil_risque"]
+                    if profil_risque not in _VALID_PROFILS:
+                        errors.append(f"profil_risque '{profil_risque}' invalide. Valeurs: {_VALID_PROFILS}")
 
         # Section patrimoine requise (v2.1)
-        if "patrimoine" not in manifest:
+        patrimoine = manifest.get("patrimoine")
+        if patrimoine is None:
             errors.append("Section patrimoine manquante (v2.1)")
         else:
-            patrimoine = manifest["patrimoine"]
-
             # Au moins un type d'actif
-            asset_sections = ["comptes_titres", "liquidites", "crypto", "metaux_precieux", "immobilier", "obligations"]
-            has_assets = any(patrimoine.get(section) for section in asset_sections)
-            if not has_assets:
+            if not any(patrimoine.get(section) for section in _ASSET_SECTIONS):
                 errors.append("Aucun actif défini dans patrimoine (au moins une section requise)")
 
             # Structure des comptes titres (si présents)
             for i, compte in enumerate(patrimoine.get("comptes_titres", [])):
-                required_fields = ["id", "custodian", "type_compte", "parser_strategy"]
-                for field in required_fields:
+                for field in _COMPTE_TITRES_REQUIRED:
                     if field not in compte:
                         errors.append(f"Compte titres #{i}: champ '{field}' manquant")
 
@@ -183,59 +369,87 @@ class PatrimoineNormalizer:
 
         if errors:
             for error in errors:
-                self.logger.error(f"  ✗ {error}")
+                self.logger.error("  ✗ %s", error)
             raise ValueError(f"Validation manifest.json échouée : {len(errors)} erreur(s)")
 
         self.logger.info("✓ Manifest validé")
 
     def _parse_all_comptes(self, comptes_manifest: List[dict]) -> List[dict]:
-        """Parse tous les comptes définis dans le manifest"""
-        comptes_parsed = []
-        sources_dir = Path(self.config["paths"]["sources"])
-
-        for compte_def in comptes_manifest:
-            compte_id = compte_def["id"]
-            self.logger.info(f"  Parsing {compte_id}...")
-
-            try:
-                # Support pour source_pattern (multi-fichiers) ou source_file (fichier unique)
-                if "source_pattern" in compte_def:
-                    # Mode pattern: parser plusieurs fichiers (ex: [BIT] - *.csv)
-                    parsed = self._parse_compte_multi_files(compte_def, sources_dir)
-                else:
-                    # Mode fichier unique (comportement legacy)
-                    filepath = sources_dir / compte_def["source_file"]
-
-                    # Validation de sécurité : empêcher path traversal
-                    try:
-                        resolved_path = filepath.resolve()
-                        sources_resolved = sources_dir.resolve()
-                        if not str(resolved_path).startswith(str(sources_resolved)):
-                            self.logger.error(f"🚨 Path traversal détecté: {filepath}")
-                            raise ValueError(f"Tentative d'accès à un fichier hors de {sources_dir}")
-                    except (ValueError, OSError) as e:
-                        self.logger.error(f"🚨 Erreur de sécurité sur le chemin: {e}")
-                        continue
+        """
+        Parse tous les comptes définis dans le manifest.
 
-                    if not filepath.exists():
-                        self.logger.error(f"    ✗ Fichier introuvable : {filepath}")
-                        continue
+        Les comptes sont indépendants (lecture + parsing de fichiers) : ils sont
+        parsés en parallèle via ThreadPoolExecutor, puis collectés dans l'ordre
+        du manifest pour garder une sortie déterministe.
+        """
+        if not comptes_manifest:
+            return []
+
+        sources_dir = self._sources_dir
+        existing = self._scan_source_names(sources_dir)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(comptes_manifest))) as executor:
+            futures = [
+                executor.submit(self._parse_one_compte, compte_def, sources_dir, existing)
+                for compte_def in comptes_manifest
+            ]
+            results = [future.result() for future in futures]
 
-                    parsed = self._parse_compte_with_strategy(compte_def, filepath)
+        return [parsed for parsed in results if parsed is not None]
 
-                # Enrichir avec métadonnées du manifest (v2.1: custodian)
-                parsed["compte_id"] = compte_id
-                parsed["etablissement_code"] = compte_def.get("custodian", compte_def.get("etablissement"))  # Support legacy
-                parsed["custodian_name"] = compte_def.get("custodian_name", "")
-                parsed["source_file"] = compte_def.get("source_file", compte_def.get("source_pattern", ""))
+    def _parse_one_compte(self, compte_def: dict, sources_dir: Path, existing: set) -> dict | None:
+        """
+        Parse un compte du manifest.
+
+        Args:
+            compte_def: Définition du compte (manifest)
+            sources_dir: Répertoire des fichiers sources
+            existing: Noms des entrées de sources_dir (voir _scan_source_names)
+
+        Returns:
+            Données parsées enrichies, ou None si le compte est ignoré (fichier
+            introuvable, chemin invalide, échec de parsing)
+        """
+        compte_id = compte_def["id"]
+        self.logger.info("  Parsing %s...", compte_id)
+        compte_def = _canonical_compte_def(compte_def)
+
+        try:
+            # Support pour source_pattern (multi-fichiers) ou source_file (fichier unique)
+            if "source_pattern" in compte_def:
+                # Mode pattern: parser plusieurs fichiers (ex: [BIT] - *.csv)
+                parsed = self._parse_compte_multi_files(compte_def, sources_dir)
+            else:
+                # Mode fichier unique (comportement legacy)
+                filepath = sources_dir / compte_def["source_file"]
+
+                # Validation de sécurité : empêcher path traversal
+                try:
+                    if not os.path.realpath(filepath).startswith(self._sources_resolved):
+                        self.logger.error("🚨 Path traversal détecté: %s", filepath)
+                        raise ValueError(f"Tentative d'accès à un fichier hors de {sources_dir}")
+                except (ValueError, OSError) as e:
+                    self.logger.error("🚨 Erreur de sécurité sur le chemin: %s", e)
+                    return None
 
-                comptes_parsed.append(parsed)
-                self.logger.info(f"    ✓ {len(parsed.get('positions', parsed.get('fonds', [])))} éléments parsés")
+                if not self._source_exists(compte_def["source_file"], sources_dir, existing):
+                    self.logger.error("    ✗ Fichier introuvable : %s", filepath)
+                    return None
 
-            except Exception as e:
-                self.logger.error(f"    ✗ Échec parsing {compte_id}: {e}")
+                parsed = self._parse_compte_with_strategy(compte_def, filepath)
 
-        return comptes_parsed
+            # Enrichir avec métadonnées du manifest (v2.1: custodian)
+            parsed["compte_id"] = compte_id
+            parsed["etablissement_code"] = compte_def["etablissement"]  # custodian (ou etablissement legacy)
+            parsed["custodian_name"] = compte_def.get("custodian_name", "")
+            parsed["source_file"] = compte_def["source"]
+
+            self.logger.info("    ✓ %s éléments parsés", len(parsed.get('positions', parsed.get('fonds', []))))
+            return parsed
+
+        except Exception as e:
+            self.logger.error("    ✗ Échec parsing %s: %s", compte_id, e)
+            return None
 
     def _parse_compte_multi_files(self, compte_def: dict, sources_dir: Path) -> dict:
         """
@@ -244,7 +458,7 @@ class PatrimoineNormalizer:
         Support du cache pour les années passées.
 
         Args:
-            compte_def: Définition du compte avec 'source_pattern'
+            compte_def: Définition du compte avec 'source_pattern' (issue de _canonical_compte_def)
             sources_dir: Répertoire des fichiers sources
 
         Returns:
@@ -264,183 +478,189 @@ class PatrimoineNormalizer:
             file_pattern = pattern
 
         # Matcher les fichiers (fnmatch/glob ont des problèmes avec [] littéraux dans les noms)
-        all_files = list(base_dir.iterdir()) if base_dir.exists() else []
-        matching_files = sorted([f for f in all_files if f.is_file() and self._matches_pattern(f.name, file_pattern)])
+        # os.scandir : le type de chaque entrée vient du readdir, pas de stat par fichier
+        matches = _compile_glob(file_pattern)
+        matching_files = []
+        symlinks = set()  # Seuls les liens peuvent sortir de base_dir (les noms d'entrées sont des feuilles)
+        if base_dir.is_dir():
+            with os.scandir(base_dir) as entries:
+                for entry in entries:
+                    if matches(entry.name) and entry.is_file():
+                        matching_files.append(Path(entry.path))
+                        if entry.is_symlink():
+                            symlinks.add(entry.name)
+            matching_files.sort()
 
         if not matching_files:
             raise FileNotFoundError(f"Aucun fichier trouvé pour le pattern: {pattern}")
 
-        self.logger.info(f"    Trouvé {len(matching_files)} fichier(s) pour {pattern}")
+        self.logger.info("    Trouvé %s fichier(s) pour %s", len(matching_files), pattern)
 
         all_positions = []
 
+        # Répertoire du pattern vérifié une fois : ses fichiers (hors liens) y restent forcément
+        try:
+            base_inside = os.path.realpath(base_dir).startswith(self._sources_resolved)
+        except (ValueError, OSError):
+            base_inside = False
+
+        # Phase 1 : planifier chaque fichier (sécurité, année, clé de cache) et charger
+        # en une seule lecture les entrées de cache valides
+        plan = []
         for filepath in matching_files:
             file_name = filepath.name
 
-            # Validation de sécurité : empêcher path traversal
-            try:
-                resolved_path = filepath.resolve()
-                sources_resolved = sources_dir.resolve()
-                if not str(resolved_path).startswith(str(sources_resolved)):
-                    self.logger.error(f"🚨 Path traversal détecté: {filepath}")
+            # Validation de sécurité : empêcher path traversal (par fichier si le répertoire
+            # n'a pas pu être validé ou si l'entrée est un lien symbolique)
+            if not base_inside or file_name in symlinks:
+                try:
+                    if not os.path.realpath(filepath).startswith(self._sources_resolved):
+                        self.logger.error("🚨 Path traversal détecté: %s", filepath)
+                        continue
+                except (ValueError, OSError) as e:
+                    self.logger.error("🚨 Erreur de sécurité sur le chemin: %s", e)
                     continue
-            except (ValueError, OSError) as e:
-                self.logger.error(f"🚨 Erreur de sécurité sur le chemin: {e}")
-                continue
 
-            # Déterminer si ce fichier doit être caché
+            # Déterminer une seule fois si ce fichier doit être caché (année extraite du nom)
+            year = None
             cache_key = None
+            cached = None
             if use_cache:
-                cache_key = self.cache_manager.get_cache_key(custodian, file_name)
-
-                # Extraire l'année pour vérifier si on doit cacher
-                year_match = re.search(r'(\d{4})', file_name)
+                year_match = _YEAR_RE.search(file_name)
                 if year_match:
                     year = int(year_match.group(1))
-                    should_cache = self.cache_manager.should_cache_year(year)
-
-                    if should_cache and self.cache_manager.is_cached(cache_key, str(filepath)):
-                        # Charger depuis le cache
-                        cached = self.cache_manager.load_from_cache(cache_key)
-                        if cached:
-                            positions = cached['data']
-                            all_positions.extend(positions)
-                            self.logger.info(f"      ✓ {file_name} (depuis cache)")
-                            continue
+                    if self.cache_manager.should_cache_year(year):
+                        cache_key = self.cache_manager.get_cache_key(custodian, file_name)
+                        cached = self.cache_manager.load_valid_entry(cache_key, str(filepath))
+
+            plan.append((filepath, year, cache_key, cached))
+
+        # Phase 2 : assembler dans l'ordre des fichiers, en ne parsant que les absents du cache
+        for filepath, year, cache_key, cached in plan:
+            file_name = filepath.name
+
+            if cached:
+                all_positions.extend(cached['data'])
+                self.logger.info("      ✓ %s (depuis cache)", file_name)
+                continue
 
             # Parser le fichier
-            self.logger.info(f"      Parsing {file_name}...")
+            self.logger.info("      Parsing %s...", file_name)
             parsed = self._parse_compte_with_strategy(compte_def, filepath)
             positions = parsed.get('positions', parsed.get('fonds', []))
             all_positions.extend(positions)
 
             # Sauvegarder dans le cache si applicable
-            if cache_key and use_cache:
-                year_match = re.search(r'(\d{4})', file_name)
-                if year_match:
-                    year = int(year_match.group(1))
-                    if self.cache_manager.should_cache_year(year):
-                        self.cache_manager.save_to_cache(
-                            cache_key,
-                            str(filepath),
-                            positions,
-                            metadata={'year': year, 'custodian': custodian}
-                        )
+            if cache_key is not None:
+                self.cache_manager.save_to_cache(
+                    cache_key,
+                    str(filepath),
+                    positions,
+                    metadata={'year': year, 'custodian': custodian}
+                )
 
         # Consolider les résultats
         return {
             'positions': all_positions,
-            'type_compte': compte_def.get('type_compte', compte_def.get('type_actif', 'Crypto'))
+            'type_compte': compte_def['type_compte']
         }
 
-    def _matches_pattern(self, filename: str, pattern: str) -> bool:
-        """
-        Vérifie si un nom de fichier correspond au pattern avec support des crochets littéraux.
-
-        Problème résolu:
-        glob("[BIT] - *.csv") retourne 0 résultats car [BIT] est interprété
-        comme un pattern de classe de caractères (match B, I, ou T).
-
-        Solution:
-        Utilise regex avec re.escape() pour traiter [BIT] littéralement:
-        1. Échapper le pattern: "[BIT] - *.csv" → r"\[BIT\] - \*\.csv"
-        2. Remplacer \*: r"\[BIT\] - \*\.csv" → r"\[BIT\] - .*\.csv"
-        3. Matcher avec re.fullmatch()
-
-        Exemples:
-            _matches_pattern("[BIT] - 2022.csv", "[BIT] - *.csv") → True
-            _matches_pattern("[XYZ] - 2022.csv", "[BIT] - *.csv") → False
-            _matches_pattern("BIT - 2022.csv", "[BIT] - *.csv") → False
-
-        Args:
-            filename: Nom du fichier à tester
-            pattern: Pattern avec wildcards (ex: "[BIT] - *.csv")
+    def _scan_source_names(self, sources_dir: Path) -> set:
+        """Liste les noms des entrées de sources_dir en un seul scandir (ensemble vide si absent)"""
+        try:
+            with os.scandir(sources_dir) as entries:
+                return {entry.name for entry in entries}
+        except OSError:
+            return set()
 
-        Returns:
-            True si le fichier correspond exactement au pattern
+    def _source_exists(self, filename: str, sources_dir: Path, existing: set) -> bool:
         """
-        # Convertir le pattern en regex-like pour gérer les cas spéciaux
-        # Remplacer * par .* mais préserver les [] littéraux
-        import re as regex_module
+        Vérifie l'existence d'un fichier source.
 
-        # Échapper tous les caractères spéciaux sauf *
-        escaped = regex_module.escape(pattern)
-        # Remplacer \* (échappé) par .* (wildcard regex)
-        regex_pattern = escaped.replace(r'\*', '.*')
-
-        # Compiler et matcher
-        return regex_module.fullmatch(regex_pattern, filename) is not None
+        Les fichiers à la racine de sources_dir sont d'abord cherchés dans le résultat de
+        _scan_source_names (pas de stat par fichier). En cas d'absence, ou pour un fichier
+        dans un sous-répertoire, l'existence est vérifiée sur le disque : les systèmes de
+        fichiers insensibles à la casse ou à la normalisation Unicode (macOS, Windows)
+        acceptent un nom qui diffère du nom listé (majuscules, accents NFC/NFD).
+        """
+        if filename in existing:
+            return True
+        return os.path.exists(os.path.join(sources_dir, filename))
 
     def _parse_compte_with_strategy(self, compte_def: dict, filepath: Path) -> dict:
-        """Parse un compte avec la stratégie définie ou fallback"""
+        """Parse un compte avec la stratégie définie ou fallback (compte_def issu de _canonical_compte_def)"""
         strategy_name = compte_def["parser_strategy"]
         fallback_strategies = compte_def.get("fallback_parsers", [])
         metadata = compte_def.get("metadata", {})
 
         # Ajouter métadonnées supplémentaires (v2.1: custodian)
-        metadata["etablissement"] = compte_def.get("custodian", compte_def.get("etablissement"))  # Support legacy
+        metadata["etablissement"] = compte_def["etablissement"]  # custodian (ou etablissement legacy)
         metadata["custodian"] = compte_def.get("custodian")
-        metadata["type_compte"] = compte_def.get("type_compte", compte_def.get("type_actif", "Crypto"))
+        metadata["type_compte"] = compte_def["type_compte"]
 
         # Ajouter montant_manuel si présent (pour fallback parsers)
         if "montant_manuel" in compte_def:
             metadata["montant_manuel"] = compte_def["montant_manuel"]
 
-        # Essayer stratégie principale + fallbacks
+        # Essayer stratégie principale + fallbacks, celles qui supportent l'extension du fichier
+        # en premier (évite un parsing voué à l'échec, ex: parser PDF sur un CSV)
         all_strategies = [strategy_name] + fallback_strategies
+        if fallback_strategies:
+            all_strategies = self.parser_registry.order_by_format(all_strategies, filepath.suffix.lstrip("."))
 
         try:
             parsed_data = self.parser_registry.parse_with_fallback(
-                str(filepath),
+                os.fspath(filepath),
                 metadata,
                 all_strategies
             )
             return parsed_data
 
         except ParsingError as e:
-            self.logger.error(f"❌ Erreur de parsing de {filepath}: {e}")
+            self.logger.error("❌ Erreur de parsing de %s: %s", filepath, e)
             raise
         except (OSError, IOError) as e:
-            self.logger.error(f"❌ Erreur d'accès au fichier {filepath}: {e}")
+            self.logger.error("❌ Erreur d'accès au fichier %s: %s", filepath, e)
             raise
         except Exception as e:
-            self.logger.error(f"❌ Erreur inattendue lors du parsing de {filepath}: {e}")
+            self.logger.error("❌ Erreur inattendue lors du parsing de %s: %s", filepath, e)
             self.logger.exception("Stack trace:")
             raise
 
-    def _enrich_etablissements_metadata(self, comptes_parsed: List[dict]):
-        """Enrichit les comptes avec les métadonnées des établissements"""
+    def _enrich_etablissements_metadata(self, comptes_parsed: List[dict]) -> Dict[str, dict]:
+        """
+        Charge les métadonnées des établissements des comptes parsés.
+
+        Returns:
+            Champs par code établissement (dicts partagés, non recopiés sur chaque compte),
+            appliqués par _group_comptes_titres à la création de l'entrée établissement.
+            Vide si etablissements_financiers.yaml est absent ou illisible.
+        """
         # Charger etablissements_financiers.yaml depuis config/
         metadata_path = Path("config") / "etablissements_financiers.yaml"
 
         if not metadata_path.exists():
-            self.logger.warning(f"Fichier etablissements_financiers.yaml introuvable : {metadata_path}")
-            return
+            self.logger.warning("Fichier etablissements_financiers.yaml introuvable : %s", metadata_path)
+            return {}
 
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = yaml.safe_load(f)
-                etablissements_meta = metadata.get("etablissements", {})
-
-            # Enrichir chaque compte
-            for compte in comptes_parsed:
-                etab_code = compte.get("etablissement_code", "")
-
-                if etab_code in etablissements_meta:
-                    meta = etablissements_meta[etab_code]
-                    compte["juridiction"] = meta.get("juridiction_principale", "France")
-                    compte["juridiction_pays"] = meta.get("pays", "France")
-                    compte["type_etablissement"] = meta.get("type", "Banque")
-                    compte["garantie_depots"] = meta.get("garantie_depots", "N/A")
-                    compte["exposition_sapin_2"] = meta.get("exposition_sapin_2", "NON")
-                    compte["exposition_risque_france"] = meta.get("exposition_risque_france", "MOYENNE")
+            etablissements_fields = _load_etablissements_fields(
+                str(metadata_path), metadata_path.stat().st_mtime_ns
+            )
 
-                    self.logger.debug(f"  Enrichi {compte['compte_id']}")
+            # Ne conserver que les établissements présents (références partagées)
+            return {
+                code: etablissements_fields[code]
+                for code in {compte.get("etablissement_code", "") for compte in comptes_parsed}
+                if code in etablissements_fields
+            }
 
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'enrichissement des métadonnées : {e}")
+            self.logger.error("Erreur lors de l'enrichissement des métadonnées : %s", e)
+            return {}
 
-    def _build_normalized_json(self, profil: dict, comptes_parsed: List[dict], manifest: dict) -> dict:
+    def _build_normalized_json(self, profil: dict, comptes_parsed: List[dict], manifest: dict,
+                               etab_fields_by_code: Dict[str, dict]) -> dict:
         """Construit le JSON normalisé final (v2.1 avec sections manuelles)"""
         data = {
             "meta": {
@@ -458,46 +678,62 @@ class PatrimoineNormalizer:
             "sources_files": []
         }
 
+        # Section patrimoine du manifest extraite une seule fois pour toutes les étapes
+        patrimoine = manifest.get("patrimoine", {})
+        sources_dir = self._sources_dir
+
         # 1. Grouper les comptes titres parsés par établissement
-        etablissements_dict = self._group_comptes_titres(comptes_parsed, data)
+        etablissements_dict = self._group_comptes_titres(comptes_parsed, data, etab_fields_by_code)
 
         # 2. Intégrer les liquidités manuelles dans les établissements existants
-        self._integrate_liquidites(manifest, etablissements_dict, data)
+        self._integrate_liquidites(patrimoine, etablissements_dict, data)
 
         # 3. Intégrer les obligations manuelles
-        self._integrate_obligations(manifest, etablissements_dict, data)
+        self._integrate_obligations(patrimoine, etablissements_dict, data)
 
         # 4. Intégrer les cryptomonnaies (dans patrimoine.crypto uniquement, pas dans établissements)
-        self._integrate_crypto(manifest, data)
+        self._integrate_crypto(patrimoine, sources_dir, data)
 
         # 5. Intégrer les métaux précieux (dans patrimoine.metaux_precieux uniquement, pas dans établissements)
-        self._integrate_metaux_precieux(manifest, data)
+        self._integrate_metaux_precieux(patrimoine, data)
 
         # 6. Intégrer l'immobilier
-        self._integrate_immobilier(manifest, data)
-
-        # Finaliser: ajouter établissements au patrimoine
-        data["patrimoine"]["financier"]["etablissements"] = list(etablissements_dict.values())
+        self._integrate_immobilier(patrimoine, data)
+
+        # Finaliser: ajouter établissements au patrimoine et calculer le total financier
+        # dans la même passe (les autres sections totalisent pendant leur intégration)
+        patrimoine_data = data["patrimoine"]
+        financier = patrimoine_data["financier"]
+        etablissements = financier["etablissements"]
+        total_financier = 0
+        for etablissement in etablissements_dict.values():
+            etablissements.append(etablissement)
+            total_financier += etablissement["total"]
+        financier["total"] = total_financier
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            # Séparateur de milliers non exprimable en style %, formatage seulement si DEBUG actif
+            total_crypto = patrimoine_data["crypto"]["total"]
+            self.logger.debug(f"Totaux calculés - Financier: {total_financier:,.0f} €, Crypto: {total_crypto:,.0f} €")
 
         return data
 
-    def _group_comptes_titres(self, comptes_parsed: List[dict], data: dict) -> dict:
-        """Groupe les comptes titres parsés par établissement"""
+    def _group_comptes_titres(self, comptes_parsed: List[dict], data: dict,
+                              etab_fields_by_code: Dict[str, dict]) -> dict:
+        """Groupe les comptes titres parsés par établissement (métadonnées : voir _enrich_etablissements_metadata)"""
         etablissements_dict = {}
+        sources_files = data["sources_files"]
+        seen_sources = set(sources_files)  # Dédoublonnage O(1) des fichiers sources
 
         for compte in comptes_parsed:
             etab_code = compte.get("etablissement_code", "unknown")
 
-            if etab_code not in etablissements_dict:
-                etablissements_dict[etab_code] = {
+            etablissement = etablissements_dict.get(etab_code)
+            if etablissement is None:
+                etablissement = etablissements_dict[etab_code] = {
                     "nom": compte.get("custodian_name", etab_code),
                     "code": etab_code,
-                    "juridiction": compte.get("juridiction", "France"),
-                    "juridiction_pays": compte.get("juridiction_pays", "France"),
-                    "type_etablissement": compte.get("type_etablissement", "Banque"),
-                    "garantie_depots": compte.get("garantie_depots", "N/A"),
-                    "exposition_sapin_2": compte.get("exposition_sapin_2", "NON"),
-                    "exposition_risque_france": compte.get("exposition_risque_france", "MOYENNE"),
+                    **etab_fields_by_code.get(etab_code, _ETAB_FIELD_DEFAULTS),
                     "total": 0,
                     "comptes": []
                 }
@@ -505,29 +741,24 @@ class PatrimoineNormalizer:
             # Ajouter compte à l'établissement
             compte_entry = {
                 "type": compte.get("type", "Compte"),
-                "montant": compte.get("montant", 0)
+                "montant": compte.get("montant", 0),
+                # Positions/fonds, solde espèces et fichier source si présents
+                **{field: compte[field] for field in _COMPTE_OPTIONAL_FIELDS if field in compte}
             }
 
-            # Ajouter positions ou fonds si présents
-            if "positions" in compte:
-                compte_entry["positions"] = compte["positions"]
-            if "fonds" in compte:
-                compte_entry["fonds"] = compte["fonds"]
-            if "solde_especes" in compte:
-                compte_entry["solde_especes"] = compte["solde_especes"]
-            if "source_file" in compte:
-                compte_entry["source_file"] = compte["source_file"]
-                if compte["source_file"] not in data["sources_files"]:
-                    data["sources_files"].append(compte["source_file"])
-
-            etablissements_dict[etab_code]["comptes"].append(compte_entry)
-            etablissements_dict[etab_code]["total"] += compte.get("montant", 0)
+            source_file = compte_entry.get("source_file")
+            if source_file is not None and source_file not in seen_sources:
+                seen_sources.add(source_file)
+                sources_files.append(source_file)
+
+            etablissement["comptes"].append(compte_entry)
+            etablissement["total"] += compte_entry["montant"]
 
         return etablissements_dict
 
-    def _integrate_liquidites(self, manifest: dict, etablissements_dict: dict, data: dict):
-        """Intègre les liquidités manuelles du manifest"""
-        liquidites = manifest.get("patrimoine", {}).get("liquidites", [])
+    def _integrate_liquidites(self, patrimoine: dict, etablissements_dict: dict, data: dict):
+        """Intègre les liquidités manuelles du manifest (section patrimoine)"""
+        liquidites = patrimoine.get("liquidites", [])
 
         for liq in liquidites:
             custodian = liq.get("custodian", "")
@@ -535,43 +766,50 @@ class PatrimoineNormalizer:
             type_compte = liq.get("type_compte", "Liquidité")
 
             # Créer ou enrichir l'établissement
-            if custodian not in etablissements_dict:
-                etablissements_dict[custodian] = self._create_etablissement_entry(liq)
+            etablissement = etablissements_dict.get(custodian)
+            if etablissement is None:
+                etablissement = etablissements_dict[custodian] = self._create_etablissement_entry(liq)
 
             # Ajouter le compte de liquidité
-            etablissements_dict[custodian]["comptes"].append({
+            etablissement["comptes"].append({
                 "type": type_compte,
                 "montant": montant
             })
-            etablissements_dict[custodian]["total"] += montant
+            etablissement["total"] += montant
 
-    def _integrate_obligations(self, manifest: dict, etablissements_dict: dict, data: dict):
-        """Intègre les obligations manuelles du manifest"""
-        obligations = manifest.get("patrimoine", {}).get("obligations", [])
+    def _integrate_obligations(self, patrimoine: dict, etablissements_dict: dict, data: dict):
+        """Intègre les obligations manuelles du manifest (section patrimoine)"""
+        obligations = patrimoine.get("obligations", [])
 
         for oblig in obligations:
             custodian = oblig.get("custodian", "")
             type_actif = oblig.get("type_actif", "Obligations")
 
             # Créer ou enrichir l'établissement
-            if custodian not in etablissements_dict:
-                etablissements_dict[custodian] = self._create_etablissement_entry(oblig)
+            etablissement = etablissements_dict.get(custodian)
+            if etablissement is None:
+                etablissement = etablissements_dict[custodian] = self._create_etablissement_entry(oblig)
 
             # Traiter chaque compte (multi-devises)
             for compte in oblig.get("comptes", []):
                 currency = compte.get("currency", "EUR")
                 montant = compte.get("montant_eur_equivalent", compte.get("montant", 0))
 
-                etablissements_dict[custodian]["comptes"].append({
+                etablissement["comptes"].append({
                     "type": f"{type_actif} ({currency})",
                     "montant": montant
                 })
-                etablissements_dict[custodian]["total"] += montant
+                etablissement["total"] += montant
 
-    def _integrate_crypto(self, manifest: dict, data: dict):
+    def _integrate_crypto(self, patrimoine: dict, sources_dir: Path, data: dict):
         """Intègre les cryptomonnaies du manifest (dans patrimoine.crypto uniquement)"""
-        cryptos = manifest.get("patrimoine", {}).get("crypto", [])
-        sources_dir = Path(self.config["paths"]["sources"])
+        cryptos = patrimoine.get("crypto", [])
+        crypto_section = data["patrimoine"]["crypto"]
+        plateformes = crypto_section["plateformes"]
+        total_crypto = 0
+        # Cours EUR unitaire par ticker (None = indisponible) : chaque ticker n'est demandé
+        # qu'une fois, y compris en cas d'échec (sinon chaque position relancerait la requête)
+        rates = {}
 
         for crypto in cryptos:
             metadata = crypto.get("metadata", {})
@@ -580,20 +818,31 @@ class PatrimoineNormalizer:
 
             # Si source_pattern ou source_file est présent, parser les fichiers
             if "source_pattern" in crypto or "source_file" in crypto:
-                self.logger.info(f"  Parsing crypto {crypto['id']}...")
+                self.logger.info("  Parsing crypto %s...", crypto['id'])
                 try:
                     # Parser le(s) fichier(s)
+                    compte_def = _canonical_compte_def(crypto)
                     if "source_pattern" in crypto:
-                        parsed = self._parse_compte_multi_files(crypto, sources_dir)
+                        parsed = self._parse_compte_multi_files(compte_def, sources_dir)
                     else:
                         filepath = sources_dir / crypto["source_file"]
                         if not filepath.exists():
-                            self.logger.error(f"    ✗ Fichier introuvable : {filepath}")
+                            self.logger.error("    ✗ Fichier introuvable : %s", filepath)
                             continue
-                        parsed = self._parse_compte_with_strategy(crypto, filepath)
+                        parsed = self._parse_compte_with_strategy(compte_def, filepath)
 
                     # Traiter chaque position parsée
                     positions = parsed.get('positions', parsed.get('fonds', []))
+
+                    # Cours des cryptos (hors fiat/stablecoins) récupérés en une seule requête
+                    missing_tickers = set()
+                    for pos in positions:
+                        ticker = pos.get('ticker', pos.get('nom', 'UNKNOWN'))
+                        if pos.get('devise', ticker).upper() not in _FIAT_STABLE_DEVISES and ticker not in rates:
+                            missing_tickers.add(ticker)
+                    if missing_tickers:
+                        rates.update(self.crypto_api.get_prices_eur(missing_tickers))
+
                     for pos in positions:
                         ticker = pos.get('ticker', pos.get('nom', 'UNKNOWN'))
                         quantite = pos.get('quantite', 0)
@@ -603,28 +852,29 @@ class PatrimoineNormalizer:
                         valeur_eur = None
 
                         # Cas 1 : Devise fiat (EUR, USD, etc.) - pas de conversion nécessaire
-                        if devise.upper() in ['EUR', 'EURO']:
+                        if devise.upper() in _FIAT_EUR_DEVISES:
                             valeur_eur = quantite
-                            self.logger.info(f"    ✓ {quantite:.2f} {devise} = {valeur_eur:.2f} EUR (fiat)")
+                            self.logger.info("    ✓ %.2f %s = %.2f EUR (fiat)", quantite, devise, valeur_eur)
 
                         # Cas 2 : Stablecoins USD (approximation 1:1 avec EUR pour simplifier)
-                        elif devise.upper() in ['USD', 'USDT', 'USDC', 'DAI', 'BUSD']:
+                        elif devise.upper() in _USD_STABLE_DEVISES:
                             valeur_eur = quantite * 0.92  # Taux de change approximatif USD→EUR
-                            self.logger.info(f"    ✓ {quantite:.2f} {devise} ≈ {valeur_eur:.2f} EUR (stablecoin)")
+                            self.logger.info("    ✓ %.2f %s ≈ %.2f EUR (stablecoin)", quantite, devise, valeur_eur)
 
                         # Cas 3 : Crypto - conversion via API générique
                         else:
-                            valeur_eur = self.crypto_api.convert_crypto_to_eur(ticker, quantite)
+                            rate = rates.get(ticker)
+                            valeur_eur = quantite * rate if rate is not None else None
 
                             if valeur_eur is not None:
-                                self.logger.info(f"    ✓ {quantite} {ticker} converti en {valeur_eur:.2f} EUR")
+                                self.logger.info("    ✓ %s %s converti en %.2f EUR", quantite, ticker, valeur_eur)
                             else:
                                 # Fallback : si API échoue, vérifier si position a déjà une valeur
                                 valeur_eur = pos.get('valeur_totale', pos.get('valeur', 0))
                                 if valeur_eur > 0:
-                                    self.logger.info(f"    ✓ {ticker} valorisé depuis données parsées: {valeur_eur:.2f} EUR")
+                                    self.logger.info("    ✓ %s valorisé depuis données parsées: %.2f EUR", ticker, valeur_eur)
                                 else:
-                                    self.logger.warning(f"    ⚠️  Impossible de valoriser {quantite} {ticker} (API indisponible)")
+                                    self.logger.warning("    ⚠️  Impossible de valoriser %s %s (API indisponible)", quantite, ticker)
                                     valeur_eur = 0
 
                         # Ajouter à la liste des actifs
@@ -637,10 +887,10 @@ class PatrimoineNormalizer:
                         })
                         montant_total += valeur_eur
 
-                    self.logger.info(f"    ✓ {len(positions)} position(s) parsée(s), montant: {montant_total:.2f} EUR")
+                    self.logger.info("    ✓ %s position(s) parsée(s), montant: %.2f EUR", len(positions), montant_total)
 
                 except Exception as e:
-                    self.logger.error(f"    ✗ Échec parsing {crypto['id']}: {e}")
+                    self.logger.error("    ✗ Échec parsing %s: %s", crypto['id'], e)
                     # Fallback sur montant manuel si présent
                     montant_total = crypto.get("montant_eur_equivalent", crypto.get("montant", 0))
                     actifs = []  # Pas de détail si parsing échoue
@@ -660,58 +910,58 @@ class PatrimoineNormalizer:
                 "actifs": actifs  # ✅ Ajout du champ actifs
             }
 
-            data["patrimoine"]["crypto"]["plateformes"].append(plateforme_entry)
+            plateformes.append(plateforme_entry)
+            total_crypto += montant_total
 
-    def _integrate_metaux_precieux(self, manifest: dict, data: dict):
+        crypto_section["total"] = total_crypto
+
+    def _integrate_metaux_precieux(self, patrimoine: dict, data: dict):
         """Intègre les métaux précieux du manifest (dans patrimoine.metaux_precieux uniquement)"""
-        metaux = manifest.get("patrimoine", {}).get("metaux_precieux", [])
+        metaux = patrimoine.get("metaux_precieux", [])
 
         if not metaux:
             return
 
-        # Regrouper par custodian
+        # Regrouper par custodian, directement au format de sortie de "custodians"
         custodians_dict = {}
         for metal in metaux:
-            custodian = metal.get("custodian", "unknown")
-            if custodian not in custodians_dict:
-                metadata = metal.get("metadata", {})
-                custodians_dict[custodian] = {
-                    "custodian_name": metal.get("custodian_name", custodian),
-                    "juridiction": metadata.get("juridiction", "France"),
-                    "juridiction_pays": metadata.get("juridiction_pays", "France"),
+            get = metal.get
+            custodian = get("custodian", "unknown")
+            entry = custodians_dict.get(custodian)
+            if entry is None:
+                entry = custodians_dict[custodian] = {
+                    "custodian": get("custodian_name", custodian),
+                    "juridiction": get("metadata", {}).get("juridiction", "France"),
                     "total": 0,
                     "details": []
                 }
 
-            custodians_dict[custodian]["total"] += metal.get("montant", 0)
-            custodians_dict[custodian]["details"].append({
-                "type": metal.get("type_actif", "Métal"),
-                "montant": metal.get("montant", 0)
+            montant = get("montant", 0)
+            entry["total"] += montant
+            entry["details"].append({
+                "type": get("type_actif", "Métal"),
+                "montant": montant
             })
 
+        metaux_section = data["patrimoine"]["metaux_precieux"]
+        custodians = list(custodians_dict.values())
+
         # Total général
-        total_metaux = sum(c["total"] for c in custodians_dict.values())
-        data["patrimoine"]["metaux_precieux"]["total"] = total_metaux
+        total_metaux = sum(c["total"] for c in custodians)
+        metaux_section["total"] = total_metaux
 
-        # Si un seul custodian, utiliser ses infos au niveau racine (pour l'analyzer legacy)
-        if len(custodians_dict) == 1:
-            custodian_data = list(custodians_dict.values())[0]
-            data["patrimoine"]["metaux_precieux"]["plateforme"] = custodian_data["custodian_name"]
-            data["patrimoine"]["metaux_precieux"]["juridiction"] = custodian_data["juridiction"]
-            data["patrimoine"]["metaux_precieux"]["juridiction_pays"] = custodian_data["juridiction_pays"]
+        # Si un seul custodian, utiliser ses infos au niveau racine (pour l'analyzer legacy) ;
+        # ses métadonnées sont celles de la première entrée du manifest
+        if len(custodians) == 1:
+            custodian_data = custodians[0]
+            metaux_section["plateforme"] = custodian_data["custodian"]
+            metaux_section["juridiction"] = custodian_data["juridiction"]
+            metaux_section["juridiction_pays"] = metaux[0].get("metadata", {}).get("juridiction_pays", "France")
 
         # Stocker détails par custodian
-        data["patrimoine"]["metaux_precieux"]["custodians"] = [
-            {
-                "custodian": v["custodian_name"],
-                "juridiction": v["juridiction"],
-                "total": v["total"],
-                "details": v["details"]
-            }
-            for v in custodians_dict.values()
-        ]
+        metaux_section["custodians"] = custodians
 
-    def _integrate_immobilier(self, manifest: dict, data: dict):
+    def _integrate_immobilier(self, patrimoine: dict, data: dict):
         """
         Intègre l'immobilier du manifest.
 
@@ -719,55 +969,44 @@ class PatrimoineNormalizer:
         via recherches web + extraction prix m². Ici on stocke uniquement
         les données brutes nécessaires au calcul.
         """
-        immobilier = manifest.get("patrimoine", {}).get("immobilier", [])
+        immobilier = patrimoine.get("immobilier", [])
+        immobilier_section = data["patrimoine"]["immobilier"]
+        biens = immobilier_section["biens"]
+        total_immobilier = 0
 
         for bien in immobilier:
-            bien_entry = {
-                "type": bien.get("type_bien", "Bien"),
-                "adresse": bien.get("adresse", ""),
-                "surface_m2": bien.get("surface_m2", 0),
-                "surface": bien.get("surface_m2", 0),  # Alias pour compatibilité
-                "prix_acquisition": bien.get("prix_acquisition", 0),
+            get = bien.get
+            surface = get("surface_m2", 0)
+            prix_acquisition = get("prix_acquisition", 0)
+            biens.append({
+                "type": get("type_bien", "Bien"),
+                "adresse": get("adresse", ""),
+                "surface_m2": surface,
+                "surface": surface,  # Alias pour compatibilité
+                "prix_acquisition": prix_acquisition,
                 # valeur_actuelle sera calculée par analyzer via web + fallback
-                "valeur_actuelle": bien.get("prix_acquisition", 0),  # Temporaire, recalculé ensuite
-                "metadata": bien.get("metadata", {})
-            }
-            data["patrimoine"]["immobilier"]["biens"].append(bien_entry)
+                "valeur_actuelle": prix_acquisition,  # Temporaire, recalculé ensuite
+                "metadata": get("metadata", {})
+            })
+            total_immobilier += prix_acquisition
+
+        immobilier_section["total"] = total_immobilier
 
     def _create_etablissement_entry(self, asset: dict) -> dict:
         """Crée une entrée établissement à partir d'un actif manuel"""
-        metadata = asset.get("metadata", {})
+        get = asset.get
+        metadata_get = get("metadata", {}).get
 
         return {
-            "nom": asset.get("custodian_name", asset.get("custodian", "Inconnu")),
-            "code": asset.get("custodian", "unknown"),
-            "juridiction": metadata.get("juridiction", "France"),  # Enrichi depuis metadata
-            "juridiction_pays": metadata.get("juridiction_pays", "France"),
-            "type_etablissement": asset.get("custody_type", "Plateforme"),
-            "garantie_depots": metadata.get("garantie_depots", "N/A"),
-            "exposition_sapin_2": metadata.get("exposition_sapin_2", "NON"),
-            "exposition_risque_france": metadata.get("exposition_risque_france", "FAIBLE"),
+            "nom": get("custodian_name", get("custodian", "Inconnu")),
+            "code": get("custodian", "unknown"),
+            "type_etablissement": get("custody_type", "Plateforme"),
+            # Enrichi depuis metadata
+            **{field: metadata_get(field, default) for field, default in _MANUAL_ETAB_META_DEFAULTS},
             "total": 0,
             "comptes": []
         }
 
-    def _calculate_totals(self, data: dict):
-        """Calcule les totaux récursifs"""
-        # Total financier
-        total_financier = sum(e.get("total", 0) for e in data["patrimoine"]["financier"]["etablissements"])
-        data["patrimoine"]["financier"]["total"] = total_financier
-
-        # Total crypto
-        total_crypto = sum(p.get("total", 0) for p in data["patrimoine"]["crypto"]["plateformes"])
-        data["patrimoine"]["crypto"]["total"] = total_crypto
-
-        # Total immobilier
-        if "biens" in data["patrimoine"]["immobilier"]:
-            total_immo = sum(b.get("valeur_actuelle", 0) for b in data["patrimoine"]["immobilier"]["biens"])
-            data["patrimoine"]["immobilier"]["total"] = total_immo
-
-        self.logger.debug(f"Totaux calculés - Financier: {total_financier:,.0f} €, Crypto: {total_crypto:,.0f} €")
-
     def _validate_normalized_data(self, data: dict):
         """Valide la cohérence des données normalisées"""
         errors = []
@@ -777,38 +1016,47 @@ class PatrimoineNormalizer:
         if not data.get("profil"):
             warnings.append("Profil vide ou incomplet")
 
-        # Validation fichiers sources
-        sources_dir = Path(self.config["paths"]["sources"])
+        # Validation fichiers sources (un seul scandir pour les fichiers à la racine de sources/)
+        sources_dir = self._sources_dir
+        existing = self._scan_source_names(sources_dir)
         for filename in data.get("sources_files", []):
-            filepath = sources_dir / filename
-            if not filepath.exists():
+            if not self._source_exists(filename, sources_dir, existing):
                 errors.append(f"Fichier source manquant : {filename}")
 
         # Validation totaux
-        financier_total = data["patrimoine"]["financier"]["total"]
-        sum_etab = sum(e.get("total", 0) for e in data["patrimoine"]["financier"]["etablissements"])
+        financier = data["patrimoine"]["financier"]
+        financier_total = financier["total"]
+
+        # Le total financier est calculé depuis les établissements dans _build_normalized_json :
+        # la re-sommation de contrôle n'est faite qu'en mode paranoid_validation
+        if self.config["normalizer"].get("paranoid_validation", False):
+            # Chaque établissement porte toujours "total" (créé à 0) ; fsum : somme exacte, sans dérive d'arrondi
+            sum_etab = math.fsum(e["total"] for e in financier["etablissements"])
 
-        if abs(financier_total - sum_etab) > 0.01:  # Tolérance pour erreurs d'arrondi
-            warnings.append(f"Incohérence total financier : {financier_total} vs {sum_etab}")
+            if not math.isclose(financier_total, sum_etab, abs_tol=0.01):  # Tolérance pour erreurs d'arrondi
+                warnings.append(f"Incohérence total financier : {financier_total} vs {sum_etab}")
 
         # Validation montants positifs
         if financier_total < 0:
             errors.append("Total financier négatif")
 
         # Affichage résultats
+        # Un seul enregistrement de log par niveau (bloc multi-ligne)
         if errors:
-            for error in errors:
-                self.logger.error(f"  ✗ {error}")
+            self.logger.error("Erreurs de validation :\n  ✗ %s", "\n  ✗ ".join(errors))
             raise ValueError(f"Validation échouée : {len(errors)} erreur(s)")
 
         if warnings:
-            for warning in warnings:
-                self.logger.warning(f"  ⚠ {warning}")
+            self.logger.warning("Avertissements de validation :\n  ⚠ %s", "\n  ⚠ ".join(warnings))
 
-        self.logger.info(f"✓ Validation OK ({len(warnings)} avertissement(s))")
+        self.logger.info("✓ Validation OK (%s avertissement(s))", len(warnings))
 
     def _save_json(self, data: dict, output_path: Path):
         """Sauvegarde le JSON normalisé"""
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Le répertoire existe presque toujours (generated/cache est créé à l'init) :
+        # mkdir seulement si l'écriture échoue faute de répertoire
+        try:
+            _write_json(output_path, data)
+        except FileNotFoundError:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_json(output_path, data)
@@ -3,19 +3,102 @@ Module de normalisation des fichiers sources
 Suit les spécifications de la section 3.1 du PRD
 """
 
+import functools
 import json
 import logging
 import re
-import pandas as pd
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, ClassVar
 from tools.utils.file_parser import FileParser
 
 
+# Expressions régulières compilées une seule fois (appliquées à chaque ligne de patrimoine.md)
+_RE_SUBSECTION = re.compile(r"####\s+(.+)")
+_RE_ETAB_HEADER = re.compile(r"###\s+(\w+)(?:\s+\((.+?)\))?$")
+_RE_PLATEFORME_HEADER = re.compile(r"###\s+(.+?)(?:\s+\((.+?)\))?$")
+_RE_PROFIL_KV = re.compile(r"-\s*(.+?)\s*:\s*(.+)")
+_RE_PROFIL_AMOUNT = re.compile(r"([\d\s,]+)\s*€")
+_RE_FILE_REF = re.compile(r'"(.+?\.(?:csv|pdf|json))"', re.IGNORECASE)
+_RE_COMPTE = re.compile(r"-\s*(.+?)\s*(?:\((\w+)\))?\s*:\s*([\d\s,.]+)\s*([€$])")
+_RE_CRYPTO_QTY = re.compile(r"-\s*(\w+)\s*:\s*([\d.]+)\s*\(([\d\s,.]+)\s*€\)")
+_RE_CRYPTO_MULTI = re.compile(r"-\s*([\w\s+()\-]+?)\s*:\s*([\d\s,.]+)\s*([€$])")
+_RE_METAL = re.compile(r"-\s*(.+?)\s*:\s*([\d\s,.]+)\s*€")
+_RE_METAL_PLATEFORME = re.compile(r"plateforme\s*:\s*(.+)", re.IGNORECASE)
+_RE_IMMO_TYPE = re.compile(r"- (.+?)\s*:")
+# Sous-détails d'un bien ("+ Prix d'aquisition : ...", "+ Lieu : ...", ...) : une recherche
+# par champ, une même ligne pouvant en porter plusieurs ("+ Lieu : Paris, Surface : 20 m²")
+_RE_IMMO_PRIX = re.compile(r"Prix d[''`]aquisition\s*:\s*([\d\s,.]+)\s*€", re.IGNORECASE)
+_RE_IMMO_LIEU = re.compile(r"Lieu\s*:\s*(.+?)(?:\(|$)", re.IGNORECASE)
+_RE_IMMO_SURFACE = re.compile(r"Surface\s*:\s*([\d\s,.]+)\s*m", re.IGNORECASE)
+_RE_IMMO_PRIX_M2 = re.compile(r"Prix m²\s*:\s*([\d\s,.]+)\s*€", re.IGNORECASE)
+_RE_AV_VALORISATION = re.compile(r"Valorisation\s*:\s*([\d\s,]+)\s*€", re.IGNORECASE)
+_RE_DIGIT = re.compile(r"\d")
+_RE_MONTANT_EUR = re.compile(r'([\d\s,\.]+)\s*€')
+_RE_SOLDE = re.compile(r'Solde[^\n]*?:([^€]+)€', re.IGNORECASE)
+_RE_NON_MONTANT = re.compile(r'[^0-9,\.\s]')
+
+# Sections principales de patrimoine.md : (préfixe du titre "## ", section)
+# ("## Cryptomonnaie" est couvert par "## Crypto")
+_SECTION_PREFIXES = (
+    ("## Profil", "profil"),
+    ("## Epargne", "epargne"),
+    ("## Épargne", "epargne"),
+    ("## Crypto", "crypto"),
+    ("## Métaux", "metaux"),
+    ("## Metaux", "metaux"),
+    ("## Immobilier", "immobilier"),
+)
+
+
+class _AmountTranslation(dict):
+    """
+    Table str.translate de _parse_amount : virgule -> point, conserve les chiffres,
+    le point et le signe négatif, supprime tout le reste (espaces, €, $...).
+
+    Chaque caractère est classé à sa première rencontre puis mémorisé.
+    """
+
+    def __missing__(self, code: int):
+        char = chr(code)
+        mapped = code if char.isdigit() or char in '.-' else None
+        self[code] = mapped
+        return mapped
+
+
+_AMOUNT_TRANSLATION = _AmountTranslation({ord(','): '.'})
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int) -> dict:
+    """
+    Charge un fichier JSON de référence, mémoïsé par (chemin, mtime).
+
+    Relu uniquement si le fichier change. Le dict retourné est partagé entre
+    les appels et ne doit pas être modifié.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 class PatrimoineNormalizer:
     """Normalise les fichiers sources en JSON structuré"""
-    
+
+    # Mapping code/nom établissement -> clé de etablissements_financiers.json
+    CODE_MAPPING: ClassVar[Dict[str, str]] = {
+        "CA": "credit_agricole",
+        "BFB": "bforbank",
+        "SG": "societe_generale",
+        "BOB": "boursobank",
+        "DGO": "degiro",
+        "Spiko": "spiko",
+        "Veracash": "veracash",
+        "Ledger": "ledger",
+        "Bitstack": "bitstack",
+        "CrypCool": "crypcool",
+        "Aave": "aave"
+    }
+
     def __init__(self, config: dict):
         self.config = config
         self.logger = logging.getLogger(__name__)
@@ -63,9 +146,6 @@ class PatrimoineNormalizer:
         if not md_path.exists():
             raise FileNotFoundError(f"Fichier patrimoine.md introuvable : {md_path}")
 
-        content = md_path.read_text(encoding='utf-8')
-        lines = content.splitlines()
-
         # Structure de base conforme à la section 3.1.4
         data = {
             "meta": {
@@ -88,102 +168,105 @@ class PatrimoineNormalizer:
         current_etablissement = None
         current_plateforme = None
         current_subsection = None  # Track subsections like "#### Métaux"
+        immobilier_lines = None  # Lignes du bien immobilier en cours (voir _parse_immobilier_bien)
+        line_count = 0
+
+        # Lecture en flux : le fichier n'est jamais chargé en entier en mémoire
+        with md_path.open(encoding='utf-8') as md_file:
+            for line in md_file:
+                line_count += 1
+                line = line.strip()
+
+                # Bien immobilier en cours : collecter ses lignes jusqu'au prochain titre
+                if immobilier_lines is not None:
+                    if line.startswith("##"):
+                        self._parse_immobilier_bien(immobilier_lines, data["patrimoine"]["immobilier"])
+                        immobilier_lines = None
+                    else:
+                        immobilier_lines.append(line)
 
-        for line_idx, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
+                if not line:
+                    continue
 
-            # Détection sections principales
-            if line.startswith("## Profil"):
-                current_section = "profil"
-                current_subsection = None
-                continue
-            elif line.startswith("## Epargne") or line.startswith("## Épargne"):
-                current_section = "epargne"
-                current_subsection = None
-                continue
-            elif line.startswith("## Crypto") or line.startswith("## Cryptomonnaie"):
-                current_section = "crypto"
-                current_subsection = None
-                continue
-            elif line.startswith("## Métaux") or line.startswith("## Metaux"):
-                current_section = "metaux"
-                current_subsection = None
-                continue
-            elif line.startswith("## Immobilier"):
-                current_section = "immobilier"
-                current_subsection = None
-                continue
+                # Détection sections principales (table consultée uniquement pour les titres "## ")
+                if line.startswith("## "):
+                    section = next((name for prefix, name in _SECTION_PREFIXES if line.startswith(prefix)), None)
+                    if section is not None:
+                        current_section = section
+                        current_subsection = None
+                        continue
 
-            # Détection subsections (#### Métaux, #### Actifs, etc.)
-            if line.startswith("#### "):
-                subsection_match = re.match(r"####\s+(.+)", line)
-                if subsection_match:
-                    current_subsection = subsection_match.group(1).strip().lower()
-                    continue
+                # Détection subsections (#### Métaux, #### Actifs, etc.)
+                elif line.startswith("#### "):
+                    subsection_match = _RE_SUBSECTION.match(line)
+                    if subsection_match:
+                        current_subsection = subsection_match.group(1).strip().lower()
+                        continue
 
-            # Section Profil
-            if current_section == "profil" and line.startswith("- "):
-                self._parse_profil_line(line, data["profil"])
-
-            # Section Epargne (établissements financiers)
-            elif current_section == "epargne":
-                if line.startswith("### "):
-                    # Nouveau établissement
-                    etab_match = re.match(r"###\s+(\w+)(?:\s+\((.+?)\))?$", line)
-                    if etab_match:
-                        code_or_nom = etab_match.group(1)
-                        nom = etab_match.group(2) if etab_match.group(2) else code_or_nom
-
-                        # Check if this is "Veracash" (metals platform) or similar without code
-                        if etab_match.group(2):
-                            code = code_or_nom
+                # Section Profil
+                if current_section == "profil" and line.startswith("- "):
+                    self._parse_profil_line(line, data["profil"])
+
+                # Section Epargne (établissements financiers)
+                elif current_section == "epargne":
+                    if line.startswith("### "):
+                        # Nouveau établissement
+                        etab_match = _RE_ETAB_HEADER.match(line)
+                        if etab_match:
+                            code_or_nom = etab_match.group(1)
+                            nom = etab_match.group(2) if etab_match.group(2) else code_or_nom
+
+                            # Check if this is "Veracash" (metals platform) or similar without code
+                            if etab_match.group(2):
+                                code = code_or_nom
+                            else:
+                                code = code_or_nom
+                                nom = code_or_nom
+
+                            current_etablissement = {
+                                "nom": nom,
+                                "code": code,
+                                "juridiction": "France",  # Par défaut
+                                "total": 0,
+                                "comptes": []
+                            }
+                            data["patrimoine"]["financier"]["etablissements"].append(current_etablissement)
+                            current_subsection = None  # Reset subsection for new establishment
+                    elif line.startswith("- ") and current_etablissement is not None:
+                        # Check if we're in a "métaux" subsection
+                        if current_subsection and ("métaux" in current_subsection or "metaux" in current_subsection):
+                            # Parse as metals, not as compte
+                            self._parse_metaux_line(line, data["patrimoine"]["metaux_precieux"], current_etablissement.get("nom"))
                         else:
-                            code = code_or_nom
-                            nom = code_or_nom
-
-                        current_etablissement = {
-                            "nom": nom,
-                            "code": code,
-                            "juridiction": "France",  # Par défaut
-                            "total": 0,
-                            "comptes": []
-                        }
-                        data["patrimoine"]["financier"]["etablissements"].append(current_etablissement)
-                        current_subsection = None  # Reset subsection for new establishment
-                elif line.startswith("- ") and current_etablissement is not None:
-                    # Check if we're in a "métaux" subsection
-                    if current_subsection and ("métaux" in current_subsection or "metaux" in current_subsection):
-                        # Parse as metals, not as compte
-                        self._parse_metaux_line(line, data["patrimoine"]["metaux_precieux"], current_etablissement.get("nom"))
-                    else:
-                        self._parse_compte_line(line, current_etablissement, data["sources_files"])
-
-            # Section Crypto
-            elif current_section == "crypto":
-                if line.startswith("### "):
-                    # Nouvelle plateforme crypto
-                    plat_match = re.match(r"###\s+(.+?)(?:\s+\((.+?)\))?$", line)
-                    if plat_match:
-                        nom = plat_match.group(1)
-                        current_plateforme = {
-                            "nom": nom,
-                            "juridiction": "France",  # Par défaut
-                            "total": 0,
-                            "actifs": []
-                        }
-                        data["patrimoine"]["crypto"]["plateformes"].append(current_plateforme)
-                elif line.startswith("- ") and current_plateforme is not None:
-                    self._parse_crypto_line(line, current_plateforme, data["sources_files"])
-
-            # Section Métaux précieux (standalone section, not subsection)
-            elif current_section == "metaux" and line.startswith("- "):
-                self._parse_metaux_line(line, data["patrimoine"]["metaux_precieux"], None)
-
-            # Section Immobilier
-            elif current_section == "immobilier" and line.startswith("### "):
-                self._parse_immobilier_line(line_idx, lines, data["patrimoine"]["immobilier"])
+                            self._parse_compte_line(line, current_etablissement, data["sources_files"])
+
+                # Section Crypto
+                elif current_section == "crypto":
+                    if line.startswith("### "):
+                        # Nouvelle plateforme crypto
+                        plat_match = _RE_PLATEFORME_HEADER.match(line)
+                        if plat_match:
+                            nom = plat_match.group(1)
+                            current_plateforme = {
+                                "nom": nom,
+                                "juridiction": "France",  # Par défaut
+                                "total": 0,
+                                "actifs": []
+                            }
+                            data["patrimoine"]["crypto"]["plateformes"].append(current_plateforme)
+                    elif line.startswith("- ") and current_plateforme is not None:
+                        self._parse_crypto_line(line, current_plateforme, data["sources_files"])
+
+                # Section Métaux précieux (standalone section, not subsection)
+                elif current_section == "metaux" and line.startswith("- "):
+                    self._parse_metaux_line(line, data["patrimoine"]["metaux_precieux"], None)
+
+                # Section Immobilier
+                elif current_section == "immobilier" and line.startswith("### "):
+                    immobilier_lines = []
+
+        if immobilier_lines is not None:
+            self._parse_immobilier_bien(immobilier_lines, data["patrimoine"]["immobilier"])
 
         # Nettoyer les établissements financiers vides (ex: Veracash dont les comptes sont dans metaux_precieux)
         data["patrimoine"]["financier"]["etablissements"] = [
@@ -191,7 +274,7 @@ class PatrimoineNormalizer:
             if etab.get("total", 0) > 0 or len(etab.get("comptes", [])) > 0
         ]
 
-        self.logger.info(f"patrimoine.md parsé : {len(content.splitlines())} lignes, {len(data['sources_files'])} fichiers référencés")
+        self.logger.info(f"patrimoine.md parsé : {line_count} lignes, {len(data['sources_files'])} fichiers référencés")
         return data
 
     def _enrich_etablissements_metadata(self, data: dict):
@@ -207,25 +290,17 @@ class PatrimoineNormalizer:
             return
 
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                etablissements_meta = metadata.get("etablissements", {})
+            metadata = _load_json_cached(str(metadata_path), metadata_path.stat().st_mtime_ns)
+            etablissements_meta = metadata.get("etablissements", {})
 
             self.logger.debug(f"Chargé etablissements_financiers.json : {len(etablissements_meta)} établissements")
 
-            # Mapping code -> clé JSON
-            code_mapping = {
-                "CA": "credit_agricole",
-                "BFB": "bforbank",
-                "SG": "societe_generale",
-                "BOB": "boursobank",
-                "DGO": "degiro",
-                "Spiko": "spiko",
-                "Veracash": "veracash",
-                "Ledger": "ledger",
-                "Bitstack": "bitstack",
-                "CrypCool": "crypcool",
-                "Aave": "aave"
+            # Métadonnées résolues une fois par code/nom connu (une seule recherche par établissement)
+            code_mapping = self.CODE_MAPPING
+            meta_by_code = {
+                code: etablissements_meta[meta_key]
+                for code, meta_key in code_mapping.items()
+                if meta_key in etablissements_meta
             }
 
             # Enrichir les établissements financiers
@@ -233,12 +308,10 @@ class PatrimoineNormalizer:
                 code = etab.get("code", "")
                 nom = etab.get("nom", "")
 
-                # Trouver la clé correspondante
-                meta_key = code_mapping.get(code) or code_mapping.get(nom)
-
-                if meta_key and meta_key in etablissements_meta:
-                    meta = etablissements_meta[meta_key]
+                # Trouver les métadonnées correspondantes (code prioritaire sur le nom)
+                meta = meta_by_code.get(code if code in code_mapping else nom)
 
+                if meta is not None:
                     # Enrichir avec les métadonnées
                     etab["juridiction"] = meta.get("juridiction_principale", "France")
                     etab["juridiction_pays"] = meta.get("pays", "France")
@@ -246,7 +319,7 @@ class PatrimoineNormalizer:
                     etab["garantie_depots"] = meta.get("garantie_depots", "N/A")
                     etab["exposition_sapin_2"] = meta.get("exposition_sapin_2", "NON")
                     etab["exposition_risque_france"] = meta.get("exposition_risque_france", "MOYENNE")
-                    etab["regulation"] = meta.get("regulation", [])
+                    etab["regulation"] = list(meta.get("regulation", []))  # Copie : meta est partagé (cache)
 
                     self.logger.debug(f"  Enrichi {nom} ({code}) : juridiction={etab['juridiction']}, Sapin2={etab['exposition_sapin_2']}")
                 else:
@@ -255,11 +328,9 @@ class PatrimoineNormalizer:
             # Enrichir les plateformes crypto
             for plat in data.get("patrimoine", {}).get("crypto", {}).get("plateformes", []):
                 nom = plat.get("nom", "")
-                meta_key = code_mapping.get(nom)
-
-                if meta_key and meta_key in etablissements_meta:
-                    meta = etablissements_meta[meta_key]
+                meta = meta_by_code.get(nom)
 
+                if meta is not None:
                     plat["juridiction"] = meta.get("juridiction_principale", "France")
                     plat["juridiction_pays"] = meta.get("pays", "France")
                     plat["type_plateforme"] = meta.get("type", "Plateforme crypto")
@@ -273,11 +344,9 @@ class PatrimoineNormalizer:
             plateforme_metaux = metaux.get("plateforme", "")
 
             if plateforme_metaux:
-                meta_key = code_mapping.get(plateforme_metaux)
-
-                if meta_key and meta_key in etablissements_meta:
-                    meta = etablissements_meta[meta_key]
+                meta = meta_by_code.get(plateforme_metaux)
 
+                if meta is not None:
                     metaux["juridiction"] = meta.get("juridiction_principale", "France")
                     metaux["juridiction_pays"] = meta.get("pays", "France")
                     metaux["stockage"] = meta.get("stockage", "N/A")
@@ -292,7 +361,7 @@ class PatrimoineNormalizer:
 
     def _parse_profil_line(self, line: str, profil: dict):
         """Parse une ligne de profil (ex: '- Genre : Homme')"""
-        match = re.match(r"-\s*(.+?)\s*:\s*(.+)", line)
+        match = _RE_PROFIL_KV.match(line)
         if match:
             key = match.group(1).strip().lower().replace(" ", "_").replace("'", "")
             value = match.group(2).strip()
@@ -326,7 +395,7 @@ class PatrimoineNormalizer:
                         profil["age"] = current_year - birth_year
 
             # Extraction des montants
-            amount_match = re.search(r"([\d\s,]+)\s*€", value)
+            amount_match = _RE_PROFIL_AMOUNT.search(value)
             if amount_match:
                 value = self._parse_amount(amount_match.group(1))
 
@@ -343,8 +412,8 @@ class PatrimoineNormalizer:
         - '- PEA : 82 186,48 €' (montant en EUR)
         - '- Compte en $ : 8076,20 $' (montant en USD, converti en EUR)
         """
-        # Détection fichier référencé
-        file_ref = re.search(r'"(.+?\.(?:csv|pdf|json))"', line, re.IGNORECASE)
+        # Détection fichier référencé (regex seulement si la ligne contient un guillemet)
+        file_ref = _RE_FILE_REF.search(line) if '"' in line else None
         if file_ref:
             filename = file_ref.group(1)
             if filename not in sources_files:
@@ -352,7 +421,7 @@ class PatrimoineNormalizer:
             return
 
         # Parsing compte avec montant (€ ou $)
-        match = re.match(r"-\s*(.+?)\s*(?:\((\w+)\))?\s*:\s*([\d\s,.]+)\s*([€$])", line)
+        match = _RE_COMPTE.match(line)
         if match:
             type_compte = match.group(1).strip()
             montant_str = match.group(3)
@@ -382,8 +451,8 @@ class PatrimoineNormalizer:
         - '- ETH : 0.5 (980.95 €)' - avec quantité et valeur décimale
         - '- Nano : 8253,10 €' - valeur directe sans quantité
         """
-        # Détection fichier référencé
-        file_ref = re.search(r'"(.+?\.(?:csv|pdf|json))"', line, re.IGNORECASE)
+        # Détection fichier référencé (regex seulement si la ligne contient un guillemet)
+        file_ref = _RE_FILE_REF.search(line) if '"' in line else None
         if file_ref:
             filename = file_ref.group(1)
             if filename not in sources_files:
@@ -391,7 +460,7 @@ class PatrimoineNormalizer:
             return
 
         # Format 1: Symbole : quantité (valeur €)
-        match_with_qty = re.match(r"-\s*(\w+)\s*:\s*([\d.]+)\s*\(([\d\s,.]+)\s*€\)", line)
+        match_with_qty = _RE_CRYPTO_QTY.match(line)
         if match_with_qty:
             symbole = match_with_qty.group(1)
             quantite = float(match_with_qty.group(2))
@@ -408,7 +477,7 @@ class PatrimoineNormalizer:
             return
 
         # Format 2: Symboles avec valeur € ou $ (ex: "BTC + ETH + VRO : 1780,95 €" ou "Pool : 1166,41 $")
-        match_multi = re.match(r"-\s*([\w\s+()\-]+?)\s*:\s*([\d\s,.]+)\s*([€$])", line)
+        match_multi = _RE_CRYPTO_MULTI.match(line)
         if match_multi:
             symboles_str = match_multi.group(1).strip()
             valeur_str = match_multi.group(2)
@@ -450,7 +519,7 @@ class PatrimoineNormalizer:
             plateforme: Nom de la plateforme (ex: "Veracash")
         """
         # Ex: "- Or : 3 355,69 €"
-        match = re.match(r"-\s*(.+?)\s*:\s*([\d\s,.]+)\s*€", line)
+        match = _RE_METAL.match(line)
         if match:
             type_metal = match.group(1).strip()
             valeur = self._parse_amount(match.group(2))
@@ -473,13 +542,14 @@ class PatrimoineNormalizer:
 
         # Détection plateforme explicite dans la ligne
         if "plateforme" in line.lower():
-            match = re.search(r"plateforme\s*:\s*(.+)", line, re.IGNORECASE)
+            match = _RE_METAL_PLATEFORME.search(line)
             if match:
                 metaux_data["plateforme"] = match.group(1).strip()
 
-    def _parse_immobilier_line(self, line_idx: int, lines: list, immobilier_data: dict):
+    def _parse_immobilier_bien(self, detail_lines: list, immobilier_data: dict):
         """
         Parse une section immobilier (section 3.1.4 du PRD)
+        detail_lines : lignes (strippées) qui suivent le titre "###", jusqu'au titre suivant
         Format attendu:
         ### Détails
         - Studio :
@@ -494,9 +564,8 @@ class PatrimoineNormalizer:
 
         if valorisation_path.exists():
             try:
-                with open(valorisation_path, 'r', encoding='utf-8') as f:
-                    valorisation_data = json.load(f)
-                    self.logger.debug(f"Chargé immobilier_valorisation.json : {len(valorisation_data.get('biens', []))} biens")
+                valorisation_data = _load_json_cached(str(valorisation_path), valorisation_path.stat().st_mtime_ns)
+                self.logger.debug(f"Chargé immobilier_valorisation.json : {len(valorisation_data.get('biens', []))} biens")
             except Exception as e:
                 self.logger.warning(f"Erreur chargement immobilier_valorisation.json: {e}")
 
@@ -504,53 +573,43 @@ class PatrimoineNormalizer:
         if "biens" not in immobilier_data:
             immobilier_data["biens"] = []
 
-        # Parser les lignes suivantes pour extraire les détails
+        # Parser les lignes du bien pour extraire les détails
         bien = {}
-        i = line_idx + 1
         current_type = None
 
-        while i < len(lines):
-            next_line = lines[i].strip()
-
-            # Arrêter si on atteint une nouvelle section
-            if next_line.startswith("##") or next_line.startswith("###"):
-                break
-
+        for next_line in detail_lines:
             # Détecter le type de bien (ex: "- Studio :")
-            type_match = re.match(r"- (.+?)\s*:", next_line)
+            type_match = _RE_IMMO_TYPE.match(next_line)
             if type_match:
                 current_type = type_match.group(1).strip()
                 bien["type"] = current_type
-                i += 1
                 continue
 
             # Parser les sous-détails (lignes commençant par +)
             if next_line.startswith("+ ") or next_line.startswith("  + "):
                 # Prix d'acquisition
-                prix_match = re.search(r"Prix d[''`]aquisition\s*:\s*([\d\s,.]+)\s*€", next_line, re.IGNORECASE)
+                prix_match = _RE_IMMO_PRIX.search(next_line)
                 if prix_match:
                     bien["prix_acquisition"] = self._parse_amount(prix_match.group(1))
 
                 # Lieu/Adresse
-                lieu_match = re.search(r"Lieu\s*:\s*(.+?)(?:\(|$)", next_line, re.IGNORECASE)
+                lieu_match = _RE_IMMO_LIEU.search(next_line)
                 if lieu_match:
                     bien["adresse"] = lieu_match.group(1).strip()
 
                 # Surface
-                surface_match = re.search(r"Surface\s*:\s*([\d\s,.]+)\s*m", next_line, re.IGNORECASE)
+                surface_match = _RE_IMMO_SURFACE.search(next_line)
                 if surface_match:
                     bien["surface_m2"] = self._parse_amount(surface_match.group(1))
 
                 # Prix au m²
-                prix_m2_match = re.search(r"Prix m²\s*:\s*([\d\s,.]+)\s*€", next_line, re.IGNORECASE)
+                prix_m2_match = _RE_IMMO_PRIX_M2.search(next_line)
                 if prix_m2_match:
                     prix_m2 = self._parse_amount(prix_m2_match.group(1))
                     # Calculer la valeur actuelle si on a surface et prix au m²
                     if "surface_m2" in bien:
                         bien["valeur_actuelle"] = round(bien["surface_m2"] * prix_m2, 2)
 
-            i += 1
-
         # Enrichir avec les données de valorisation si disponibles
         if valorisation_data and bien:
             for valorisation_bien in valorisation_data.get("biens", []):
@@ -568,7 +627,8 @@ class PatrimoineNormalizer:
 
                     # Ajouter les sources de valorisation
                     if "valorisation_actuelle" in valorisation_bien:
-                        bien["valorisation_sources"] = valorisation_bien["valorisation_actuelle"].get("sources", [])
+                        # Copie : valorisation_data est partagé (cache)
+                        bien["valorisation_sources"] = list(valorisation_bien["valorisation_actuelle"].get("sources", []))
 
                     self.logger.debug(f"Enrichissement bien immobilier avec valorisation_json")
                     break
@@ -591,16 +651,10 @@ class PatrimoineNormalizer:
         if not amount_str:
             return 0.0
 
-        # Convertir en string au cas où
-        amount_str = str(amount_str)
-
-        # Enlever espaces et symboles monétaires
-        amount_str = amount_str.replace(" ", "").replace("\xa0", "").replace("€", "").replace("$", "")
-        # Remplacer virgule par point
-        amount_str = amount_str.replace(",", ".")
-
-        # Enlever tout ce qui n'est pas un chiffre, un point ou un signe négatif
-        amount_str = ''.join(c for c in amount_str if c.isdigit() or c in '.-')
+        # Convertir en string au cas où, puis en un seul passage : virgule -> point et
+        # suppression de tout ce qui n'est pas un chiffre, un point ou un signe négatif
+        # (espaces, espaces insécables, symboles monétaires...)
+        amount_str = str(amount_str).translate(_AMOUNT_TRANSLATION)
 
         try:
             return float(amount_str) if amount_str else 0.0
@@ -652,19 +706,25 @@ class PatrimoineNormalizer:
         if "positions" not in compte:
             compte["positions"] = []
 
-        for _, row in df.iterrows():
+        # Colonnes converties une seule fois (pas de Series construite par ligne comme avec iterrows)
+        tickers = [str(ticker) for ticker in df["ticker"].tolist()] if "ticker" in df.columns else None
+        numeric_columns = [
+            (column, df[column].tolist(), df[column].notna().tolist())
+            for column in ("quantite", "prix", "valeur")
+            if column in df.columns
+        ]
+
+        positions = compte["positions"]
+        for i in range(len(df)):
             position = {}
-            if "ticker" in row:
-                position["ticker"] = str(row["ticker"])
-            if "quantite" in row and pd.notna(row["quantite"]):
-                position["quantite"] = float(row["quantite"])
-            if "prix" in row and pd.notna(row["prix"]):
-                position["prix"] = float(row["prix"])
-            if "valeur" in row and pd.notna(row["valeur"]):
-                position["valeur"] = float(row["valeur"])
+            if tickers is not None:
+                position["ticker"] = tickers[i]
+            for column, values, present in numeric_columns:
+                if present[i]:
+                    position[column] = float(values[i])
 
             if position:
-                compte["positions"].append(position)
+                positions.append(position)
 
         compte["source_file"] = filename
         self.logger.debug(f"  → {len(df)} positions chargées")
@@ -759,7 +819,7 @@ class PatrimoineNormalizer:
                     continue
 
                 # Extraire la valorisation (format: "Valorisation : 58 100,39 €")
-                valeur_match = re.search(r"Valorisation\s*:\s*([\d\s,]+)\s*€", valeur_str, re.IGNORECASE)
+                valeur_match = _RE_AV_VALORISATION.search(valeur_str)
                 if valeur_match:
                     valeur = self._parse_amount(valeur_match.group(1))
                     if valeur > 0:
@@ -783,7 +843,7 @@ class PatrimoineNormalizer:
                     valeur_str = ""
 
                     for cell in row[1:]:
-                        if cell and re.search(r"\d", str(cell)):
+                        if cell and _RE_DIGIT.search(str(cell)):
                             valeur_str = str(cell)
                             break
 
@@ -829,7 +889,7 @@ class PatrimoineNormalizer:
                 if i + 1 < len(lines):
                     valorisation_line = lines[i + 1]
                     # Extraire tous les montants de la ligne
-                    montants = re.findall(r'([\d\s,\.]+)\s*€', valorisation_line)
+                    montants = _RE_MONTANT_EUR.findall(valorisation_line)
                     if len(montants) >= 3:
                         # Le 3ème montant est le solde espèces
                         especes_str = montants[2]
@@ -841,10 +901,10 @@ class PatrimoineNormalizer:
                             pass
 
         # Fallback: si la méthode ci-dessus échoue, essayer d'extraire depuis "Solde disponible"
-        match = re.search(r'Solde[^\n]*?:([^€]+)€', text, re.IGNORECASE)
+        match = _RE_SOLDE.search(text)
         if match:
             montant_str = match.group(1)
-            montant_str = re.sub(r'[^0-9,\.\s]', '', montant_str)
+            montant_str = _RE_NON_MONTANT.sub('', montant_str)
             return self._parse_amount(montant_str)
 
         return 0.0
@@ -3,7 +3,9 @@ Registry central de tous les parsers disponibles
 Gère l'enregistrement, la sélection et l'auto-détection des parsers
 """
 
+import importlib
 import logging
+import threading
 from typing import Dict, List, Tuple, Type, Optional
 from .base_parser import BaseParser, ParsingError
 
@@ -13,6 +15,12 @@ class ParserRegistry:
 
     def __init__(self):
         self._parsers: Dict[str, BaseParser] = {}
+        # Un verrou par parser : les instances sont partagées et certains parsers
+        # gardent un état pendant parse() (ex: Bitstack), le parsing peut être concurrent
+        self._locks: Dict[str, threading.Lock] = {}
+        # Parsers enregistrés paresseusement : strategy_name -> "module:Classe", importés au premier usage
+        self._lazy: Dict[str, str] = {}
+        self._lazy_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
 
     def register(self, parser_class: Type[BaseParser]):
@@ -34,12 +42,62 @@ class ParserRegistry:
                 self.logger.warning(f"Parser '{strategy_name}' déjà enregistré, écrasement")
 
             self._parsers[strategy_name] = parser
+            self._lazy.pop(strategy_name, None)
+            self._locks[strategy_name] = threading.Lock()
             self.logger.debug(f"Parser enregistré : {strategy_name} (formats: {parser.supported_formats})")
 
         except Exception as e:
             self.logger.error(f"Erreur lors de l'enregistrement du parser {parser_class.__name__}: {e}")
             raise
 
+    def register_lazy(self, strategy_name: str, dotted_path: str):
+        """
+        Enregistre un parser sans l'importer.
+
+        Le module n'est importé (et le parser instancié) qu'au premier usage de la
+        stratégie : un run qui n'utilise que des CSV ne charge pas pdfplumber/openpyxl.
+
+        Args:
+            strategy_name: Nom de la stratégie (doit correspondre à parser.strategy_name)
+            dotted_path: Chemin "module:Classe" (ex: 'tools.parsers.generic:GenericCSVParser')
+
+        Example:
+            registry.register_lazy('generic.csv.flexible', 'tools.parsers.generic:GenericCSVParser')
+        """
+        if strategy_name in self._locks:
+            self.logger.warning(f"Parser '{strategy_name}' déjà enregistré, écrasement")
+            self._parsers.pop(strategy_name, None)
+
+        self._lazy[strategy_name] = dotted_path
+        self._locks[strategy_name] = threading.Lock()
+        self.logger.debug(f"Parser enregistré (différé) : {strategy_name} ({dotted_path})")
+
+    def _load_lazy(self, strategy_name: str):
+        """Importe et instancie un parser enregistré via register_lazy()"""
+        with self._lazy_lock:
+            dotted_path = self._lazy.get(strategy_name)
+            if dotted_path is None:
+                return  # Déjà chargé par un autre thread
+
+            module_name, class_name = dotted_path.split(":")
+            parser_class = getattr(importlib.import_module(module_name), class_name)
+            parser = parser_class()
+
+            if parser.strategy_name != strategy_name:
+                raise ValueError(
+                    f"Parser {dotted_path} déclare '{parser.strategy_name}' "
+                    f"mais a été enregistré sous '{strategy_name}'"
+                )
+
+            self._parsers[strategy_name] = parser
+            del self._lazy[strategy_name]
+            self.logger.debug(f"Parser chargé : {strategy_name} (formats: {parser.supported_formats})")
+
+    def _load_all(self):
+        """Charge tous les parsers différés (auto-détection, recherche par format)"""
+        for strategy_name in list(self._lazy):
+            self._load_lazy(strategy_name)
+
     def get_parser(self, strategy_name: str) -> BaseParser:
         """
         Récupère un parser par son nom de stratégie
@@ -53,8 +111,11 @@ class ParserRegistry:
         Raises:
             ValueError: Si le parser n'existe pas
         """
+        if strategy_name in self._lazy:
+            self._load_lazy(strategy_name)
+
         if strategy_name not in self._parsers:
-            available = list(self._parsers.keys())
+            available = self.list_parsers()
             raise ValueError(f"Parser inconnu : '{strategy_name}'. Parsers disponibles : {available}")
 
         return self._parsers[strategy_name]
@@ -78,6 +139,7 @@ class ParserRegistry:
                 best_parser = registry.get_parser(candidates[0][0])
         """
         candidates = []
+        self._load_all()
 
         for strategy_name, parser in self._parsers.items():
             try:
@@ -125,11 +187,12 @@ class ParserRegistry:
                 parser = self.get_parser(strategy_name)
                 self.logger.info(f"Tentative parsing avec {strategy_name}...")
 
-                # Parse
-                parsed_data = parser.parse(filepath, metadata)
+                with self._locks[strategy_name]:
+                    # Parse
+                    parsed_data = parser.parse(filepath, metadata)
 
-                # Validate
-                anomalies = parser.validate(parsed_data)
+                    # Validate
+                    anomalies = parser.validate(parsed_data)
                 if anomalies:
                     self.logger.warning(f"Anomalies détectées avec {strategy_name}: {anomalies}")
 
@@ -157,8 +220,8 @@ class ParserRegistry:
         )
 
     def list_parsers(self) -> List[str]:
-        """Retourne la liste de tous les parsers enregistrés"""
-        return list(self._parsers.keys())
+        """Retourne la liste de tous les parsers enregistrés (chargés ou différés), dans l'ordre d'enregistrement"""
+        return list(self._locks.keys())
 
     def get_parsers_by_format(self, file_format: str) -> List[str]:
         """
@@ -171,6 +234,7 @@ class ParserRegistry:
             Liste des strategy_name supportant ce format
         """
         compatible = []
+        self._load_all()
 
         for strategy_name, parser in self._parsers.items():
             if file_format.lower() in [fmt.lower() for fmt in parser.supported_formats]:
@@ -178,5 +242,50 @@ class ParserRegistry:
 
         return compatible
 
+    def order_by_format(self, strategies: List[str], file_format: str) -> List[str]:
+        """
+        Réordonne des stratégies pour essayer d'abord celles qui supportent le format du fichier.
+
+        Tri stable : l'ordre déclaré (principale puis fallbacks) est conservé au sein de
+        chaque groupe. Une stratégie inconnue ou non importable reste dans le second groupe
+        (son erreur sera remontée par parse_with_fallback). Si la stratégie principale
+        supporte déjà le format, l'ordre est conservé tel quel sans charger les fallbacks.
+
+        Args:
+            strategies: Stratégies dans l'ordre déclaré
+            file_format: Extension du fichier ('pdf', 'csv', ...)
+
+        Returns:
+            Liste des stratégies, formats compatibles en premier
+
+        Example:
+            registry.order_by_format(['credit_agricole.pea.v2025', 'generic.csv.flexible'], 'csv')
+            # → ['generic.csv.flexible', 'credit_agricole.pea.v2025']
+        """
+        file_format = file_format.lower()
+
+        def supports(strategy_name: str) -> bool:
+            try:
+                formats = self.get_parser(strategy_name).supported_formats
+            except (ImportError, AttributeError, ValueError):
+                # Module absent, classe introuvable ou stratégie inconnue/mal enregistrée
+                return False
+            return file_format in (fmt.lower() for fmt in formats)
+
+        # Cas courant : la principale convient, inutile d'importer/instancier les fallbacks
+        if not strategies or supports(strategies[0]):
+            return list(strategies)
+
+        matching = []
+        others = []
+
+        for strategy_name in strategies:
+            if supports(strategy_name):
+                matching.append(strategy_name)
+            else:
+                others.append(strategy_name)
+
+        return matching + others
+
     def __repr__(self):
-        return f"<ParserRegistry parsers={len(self._parsers)}>"
+        return f"<ParserRegistry parsers={len(self._locks)}>"